@@ -0,0 +1,47 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helper to measure the cost of importing interface libraries.
+
+Relation handlers import their interface library when setting up their
+event handlers. Cold imports of the larger libraries are a significant
+part of short hooks, `profile` logs what a block imported and how long
+it took.
+"""
+
+import logging
+import sys
+import time
+import typing
+from contextlib import (
+    contextmanager,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def profile(label: str) -> typing.Iterator[None]:
+    """Log the time spent in block under label if it imported modules."""
+    modules = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        imported = len(sys.modules) - modules
+        if imported > 0:
+            logger.debug(
+                f"{label} imported {imported} modules in {elapsed:.3f}s"
+            )
@@ -27,6 +27,8 @@ develop a new k8s charm using the Operator Framework:
 
 import base64
 import binascii
+import functools
+import hashlib
 import json
 import logging
 import os
@@ -39,7 +41,9 @@ from pathlib import (
     Path,
 )
 from typing import (
+    Callable,
     Dict,
+    Iterable,
     List,
     Mapping,
 )
@@ -100,6 +104,10 @@ from ops.model import (
 from utils import (
     certs,
     manager,
+    request_queue,
+)
+from utils.client import (
+    KeystoneExceptionError,
 )
 
 logger = logging.getLogger(__name__)
@@ -112,6 +120,11 @@ CERTIFICATE_TRANSFER_LABEL = "certs_to_transfer"
 KEYSTONE_CONF = "/etc/keystone/keystone.conf"
 LOGGING_CONF = "/etc/keystone/logging.conf"
 SYSTEM_CA_CERTS = "/etc/ssl/certs/ca-certificates.crt"
+# Seconds the leader spends processing client requests in a single hook.
+OUTSTANDING_REQUESTS_BUDGET = 120
+# Service users retired by the leader in a single hook once their rotated
+# credentials are no longer in use.
+RETIRED_USERS_PER_HOOK = 5
 
 OAUTH = "oauth"
 RECEIVE_CA_CERTS = "receive-ca-cert"
@@ -145,6 +158,26 @@ _MELLON_SP_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
 """
 
 
+class OutstandingRequestsEvent(ops.EventBase):
+    """Continue processing outstanding client requests."""
+
+
+class KeystoneCharmEvents(ops.CharmEvents):
+    """Events emitted by the keystone charm."""
+
+    outstanding_requests = ops.EventSource(OutstandingRequestsEvent)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_op_template(value: str) -> jinja2.Template:
+    """Compile op parameter template.
+
+    Consumers send the same requests over and over, compile each
+    parameter once per hook.
+    """
+    return jinja2.Template(value)
+
+
 @sunbeam_tracing.trace_type
 class KeystoneLoggingAdapter(sunbeam_contexts.ConfigContext):
     """Config adapter to collect logging config."""
@@ -961,11 +994,31 @@ class WSGIKeystonePebbleHandler(sunbeam_chandlers.WSGIPebbleHandler):
             logger.exception("Failed to disable keystone site in apache")
         super().init_service(context)
 
+    @staticmethod
+    def _reload_service(container: ops.Container, service_name: str) -> None:
+        """Gracefully restart apache in container.
+
+        Requests in flight are completed by the old workers while new
+        workers load the updated configuration and keys.
+
+        :param container: Container to reload service in.
+        :param service_name: Service to reload.
+        """
+        container.send_signal("SIGUSR1", service_name)
+
+    @property
+    def _restart_methods(
+        self,
+    ) -> Mapping[str, Callable[[ops.Container, str], None]]:
+        """Reload the wsgi service rather than restarting it."""
+        return {self.wsgi_service_name: self._reload_service}
+
 
 @sunbeam_tracing.trace_sunbeam_charm(extra_types=(manager.KeystoneManager,))
 class KeystoneOperatorCharm(sunbeam_charm.OSBaseOperatorAPICharm):
     """Charm the service."""
 
+    on = KeystoneCharmEvents()  # type: ignore
     _state = StoredState()
     _authed = False
     service_name = "keystone"
@@ -1005,6 +1058,9 @@ class KeystoneOperatorCharm(sunbeam_charm.OSBaseOperatorAPICharm):
         self._state.set_default(admin_domain_id=None)
         self._state.set_default(default_domain_id=None)
         self._state.set_default(service_project_id=None)
+        self._state.set_default(key_manifests={})
+        self._state.set_default(domain_digests={})
+        self._state.set_default(federation_manifests={})
 
         self.certificate_transfer = CertificateTransferProvides(
             self, self.SEND_CA_CERT_RELATION_NAME
@@ -1048,6 +1104,10 @@ class KeystoneOperatorCharm(sunbeam_charm.OSBaseOperatorAPICharm):
             self.on.secret_changed,
             self.configure_charm,
         )
+        self.framework.observe(
+            self.on.outstanding_requests, self._on_outstanding_requests
+        )
+        self.framework.observe(self.on.update_status, self._on_update_status)
 
     def merged_fid_contexts(self):
         """Create a merged context from oauth and external_idp."""
@@ -1665,14 +1725,10 @@ export OS_AUTH_VERSION=3
                 for k, v in keys.items()
             }
 
-            existing_keys = self.keystone_manager.read_keys(
-                key_repository="/etc/keystone/fernet-keys"
-            )
-            if keys and keys != existing_keys:
-                logger.info("Updating fernet keys")
-                self.keystone_manager.write_keys(
-                    key_repository="/etc/keystone/fernet-keys", keys=keys
-                )
+            if self.keystone_manager.sync_keys(
+                key_repository="/etc/keystone/fernet-keys", keys=keys
+            ):
+                logger.info("Updated fernet keys")
 
         credential_keys_secret_id = self.peers.get_app_data(
             "credential-keys-secret-id"
@@ -1691,14 +1747,10 @@ export OS_AUTH_VERSION=3
                 for k, v in keys.items()
             }
 
-            existing_keys = self.keystone_manager.read_keys(
-                key_repository="/etc/keystone/credential-keys"
-            )
-            if keys and keys != existing_keys:
-                logger.info("Updating credential keys")
-                self.keystone_manager.write_keys(
-                    key_repository="/etc/keystone/credential-keys", keys=keys
-                )
+            if self.keystone_manager.sync_keys(
+                key_repository="/etc/keystone/credential-keys", keys=keys
+            ):
+                logger.info("Updated credential keys")
 
     def _on_secret_changed(self, event: ops.charm.SecretChangedEvent):
         logger.debug(
@@ -1711,14 +1763,10 @@ export OS_AUTH_VERSION=3
                 (k[prefix_len:] if k.startswith(FERNET_KEYS_PREFIX) else k): v
                 for k, v in keys.items()
             }
-            existing_keys = self.keystone_manager.read_keys(
-                key_repository="/etc/keystone/fernet-keys"
-            )
-            if keys and keys != existing_keys:
-                logger.info("secret-change event: Updating the fernet keys")
-                self.keystone_manager.write_keys(
-                    key_repository="/etc/keystone/fernet-keys", keys=keys
-                )
+            if self.keystone_manager.sync_keys(
+                key_repository="/etc/keystone/fernet-keys", keys=keys
+            ):
+                logger.info("secret-change event: Updated the fernet keys")
         elif event.secret.label == "credential-keys":
             keys = event.secret.get_content(refresh=True)
             prefix_len = len(FERNET_KEYS_PREFIX)
@@ -1726,16 +1774,10 @@ export OS_AUTH_VERSION=3
                 (k[prefix_len:] if k.startswith(FERNET_KEYS_PREFIX) else k): v
                 for k, v in keys.items()
             }
-            existing_keys = self.keystone_manager.read_keys(
-                key_repository="/etc/keystone/credential-keys"
-            )
-            if keys and keys != existing_keys:
-                logger.info(
-                    "secret-change event: Updating the credential keys"
-                )
-                self.keystone_manager.write_keys(
-                    key_repository="/etc/keystone/credential-keys", keys=keys
-                )
+            if self.keystone_manager.sync_keys(
+                key_repository="/etc/keystone/credential-keys", keys=keys
+            ):
+                logger.info("secret-change event: Updated the credential keys")
         else:
             # By default read the latest content of secret
             # this will allow juju to trigger secret-remove
@@ -1800,16 +1842,16 @@ export OS_AUTH_VERSION=3
             )
 
             logger.info(f"Creating service account with username {username}")
-            self._create_service_account_with_retry(
-                event, username, password, extra_roles
-            )
+            with self.keystone_manager.ksclient.cached_lookups():
+                self._create_service_account_with_retry(
+                    event, username, password, extra_roles
+                )
             olduser = event.secret.get_content(refresh=True).get("username")
             event.secret.set_content(
                 {"username": username, "password": password}
             )
-            old_service_users = self.peers.get_app_data("old_service_users")
-            service_users_to_delete = (
-                json.loads(old_service_users) if old_service_users else []
+            service_users_to_delete = self._get_service_users(
+                "old_service_users"
             )
             if olduser not in service_users_to_delete:
                 service_users_to_delete.append(olduser)
@@ -1868,25 +1910,73 @@ export OS_AUTH_VERSION=3
             for relation in self.model.relations[self.IDSVC_RELATION_NAME]
         ]
         if event.secret.label in identity_labels:
-            deleted_users = []
-            old_service_users = self.peers.get_app_data("old_service_users")
-            service_users_to_delete = (
-                json.loads(old_service_users) if old_service_users else []
-            )
-            for user in service_users_to_delete:
-                # Only delete users created during rotation of event.secret
+            # The users of removed revisions are no longer in use, queue
+            # them for deletion by the leader in a later hook.
+            old_users = self._get_service_users("old_service_users")
+            retired_users = self._get_service_users("retired_service_users")
+            for user in old_users:
+                # Only retire users created during rotation of event.secret
                 if f"{CREDENTIALS_SECRET_PREFIX}{user}".startswith(
                     event.secret.label
                 ):
-                    logger.info(f"Deleting user {user} from keystone")
-                    self.keystone_manager.ksclient.delete_user(user)
-                    deleted_users.append(user)
-            service_users_to_delete = [
-                x for x in service_users_to_delete if x not in deleted_users
-            ]
+                    retired_users.append(user)
             self.peers.set_app_data(
-                {"old_service_users": json.dumps(service_users_to_delete)}
+                {
+                    "old_service_users": json.dumps(
+                        [x for x in old_users if x not in retired_users]
+                    ),
+                    "retired_service_users": json.dumps(retired_users),
+                }
+            )
+
+    def _get_service_users(self, key: str) -> list[str]:
+        """Service users listed under key in the peer application data."""
+        users = self.peers.get_app_data(key)
+        return json.loads(users) if users else []
+
+    def retire_service_users(self) -> None:
+        """Delete a bounded number of retired service users from keystone.
+
+        Users left over are retired in a later hook. Users which could not
+        be deleted are retried after the others, users which cannot be
+        looked up are dropped.
+        """
+        retired_users = self._get_service_users("retired_service_users")
+        if not retired_users or not self.can_service_requests():
+            return
+        processed_users = retired_users[:RETIRED_USERS_PER_HOOK]
+        failed_users = []
+        for user in processed_users:
+            logger.info(f"Deleting user {user} from keystone")
+            try:
+                self.keystone_manager.ksclient.delete_user(user)
+            except keystoneauth1.exceptions.NotFound:
+                logger.debug(f"User {user} already deleted")
+            except KeystoneExceptionError:
+                logger.warning(
+                    f"Cannot look up user {user}, not retrying",
+                    exc_info=True,
+                )
+            except keystoneauth1.exceptions.ClientException:
+                logger.warning(
+                    f"Failed to delete user {user}, retrying later",
+                    exc_info=True,
+                )
+                failed_users.append(user)
+        retired_users = [
+            x for x in retired_users if x not in processed_users
+        ] + failed_users
+        if retired_users:
+            logger.info(
+                f"{len(retired_users)} retired service users left to delete"
             )
+        self.peers.set_app_data(
+            {"retired_service_users": json.dumps(retired_users)}
+        )
+
+    def _on_update_status(self, event: ops.framework.EventBase) -> None:
+        """Retire service users."""
+        self.retire_service_users()
 
     def get_pebble_handlers(self) -> List[sunbeam_chandlers.PebbleHandler]:
         """Pebble handlers for the service."""
@@ -2047,9 +2137,9 @@ export OS_AUTH_VERSION=3
         If force flag is True, process identity services on all
         the connected relations even if its already processed.
         """
-        for relation in self.framework.model.relations[
-            self.IDSVC_RELATION_NAME
-        ]:
+        for relation in self.request_queue.pending(
+            self.IDSVC_RELATION_NAME, force
+        ):
             app_data = relation.data[relation.app]
             extra_roles = self._identity_service_extra_roles(app_data)
             processed_extra_roles = relation.data[self.app].get(
@@ -2058,6 +2148,7 @@ export OS_AUTH_VERSION=3
             requested_extra_roles = self._extra_roles_marker(extra_roles)
             if (
                 not force
+                and not self.request_queue.inputs_changed(relation)
                 and relation.data[self.app].get("service-credentials")
                 and relation.data[self.app].get("admin-role")
                 and processed_extra_roles == requested_extra_roles
@@ -2085,6 +2176,7 @@ export OS_AUTH_VERSION=3
                         "Cannot process client request, 'service-endpoints' "
                         "not supplied"
                     )
+            self.request_queue.done(relation)
 
     @staticmethod
     def _extra_roles_marker(extra_roles: List[str]) -> str:
@@ -2114,12 +2206,13 @@ export OS_AUTH_VERSION=3
         If force flag is True, process identity credentials on all
         the connected relations even if its already processed.
         """
-        for relation in self.framework.model.relations[
-            self.IDCREDS_RELATION_NAME
-        ]:
+        for relation in self.request_queue.pending(
+            self.IDCREDS_RELATION_NAME, force
+        ):
             app_data = relation.data[relation.app]
             if (
                 not force
+                and not self.request_queue.inputs_changed(relation)
                 and relation.data[self.app].get("credentials")
                 and relation.data[self.app].get("admin-role")
             ):
@@ -2141,6 +2234,17 @@ export OS_AUTH_VERSION=3
                         "Cannot process client request, 'username' not "
                         "supplied"
                     )
+            self.request_queue.done(relation)
+
+    @staticmethod
+    def _domain_of_file(file_name: str) -> str | None:
+        """Domain of a keystone.<domain>.conf or keystone.<domain>.crt file."""
+        if not file_name.startswith("keystone."):
+            return None
+        domain, _, suffix = file_name.removeprefix("keystone.").rpartition(".")
+        if suffix not in ("conf", "crt"):
+            return None
+        return domain or None
 
     def remove_old_domains(
         self, domain_configs: dict, container: ops.model.Container
@@ -2157,14 +2261,15 @@ export OS_AUTH_VERSION=3
             "keystone-combined.crt",
         ]
         for domain_file in container.list_files(self.domain_config_dir):
-            domain_on_disk = domain_file.name.split(".")[1]
+            domain_on_disk = self._domain_of_file(domain_file.name)
             if domain_on_disk in active_domains:
                 logger.debug("Keeping {}".format(domain_file.name))
             else:
                 container.remove_path(domain_file.path)
-                removed_domains.append(domain_on_disk)
+                if domain_on_disk:
+                    removed_domains.append(domain_on_disk)
         for domain_file in container.list_files(self.domain_ca_dir):
-            domain_on_disk = domain_file.name.split(".")[1]
+            domain_on_disk = self._domain_of_file(domain_file.name)
             if (
                 domain_on_disk in active_domains
                 or domain_file.name in exclude_list
@@ -2179,6 +2284,18 @@ export OS_AUTH_VERSION=3
     ) -> List[str]:
         """Update domain configuration."""
         updated_domains = []
+        with self.keystone_manager.ksclient.cached_lookups():
+            self._update_domain_config(
+                domain_configs, container, updated_domains
+            )
+        return updated_domains
+
+    def _update_domain_config(
+        self,
+        domain_configs: list,
+        container: ops.model.Container,
+        updated_domains: List[str],
+    ) -> None:
         for domain_config in domain_configs:
             domain_name = domain_config["domain-name"]
             domain = self.keystone_manager.ksclient.get_domain_object(
@@ -2222,30 +2339,98 @@ export OS_AUTH_VERSION=3
                     )
                     updated_domains.append(domain_name)
 
-        return updated_domains
+    @staticmethod
+    def _domain_digests(domain_config: dict) -> Dict[str, str]:
+        """Digests of the configuration and CA of a domain."""
+        return {
+            key: hashlib.sha256(
+                domain_config.get(key, "").encode()
+            ).hexdigest()
+            for key in ("config-contents", "ca")
+        }
+
+    def _domains_on_disk(self, container: ops.model.Container) -> set:
+        """Names of the domains with a configuration file on disk."""
+        try:
+            files = container.list_files(self.domain_config_dir)
+        except (ops.pebble.APIError, ops.pebble.PathError):
+            return set()
+        return {
+            domain
+            for file in files
+            if (domain := self._domain_of_file(file.name))
+        }
 
     def configure_domains(self, event: ops.framework.EventBase = None) -> None:
-        """Configure LDAP backed domains."""
+        """Configure LDAP backed domains.
+
+        The digests of the domains written to disk are kept in the unit
+        state, only the domains whose configuration changed since are
+        updated or removed, and keystone is only reloaded if any did.
+        """
         if isinstance(event, sunbeam_dc_svc.DomainConfigGoneAwayEvent):
             exclude = [event.relation]
         else:
             exclude = []
         container = self.unit.get_container(KEYSTONE_CONTAINER)
+        domain_configs = self.dc.get_domain_configs(exclude=exclude)
+        digests = {
+            domain_config["domain-name"]: self._domain_digests(domain_config)
+            for domain_config in domain_configs
+        }
+        configured = dict(self._state.domain_digests)
+        trusted = self._domains_on_disk(container) == set(configured)
+        if not trusted:
+            # Files changed behind our back, e.g. the container restarted.
+            configured = {}
+        changed = [
+            domain_config
+            for domain_config in domain_configs
+            if configured.get(domain_config["domain-name"])
+            != digests[domain_config["domain-name"]]
+        ]
+        gone = set(configured) - set(digests)
+        if trusted and not changed and not gone:
+            logger.debug("Domain configuration unchanged")
+            return
+
         for d in [self.domain_config_dir, self.domain_ca_dir]:
             if not container.isdir(d):
                 container.make_dir(d, make_parents=True)
-        domain_configs = self.dc.get_domain_configs(exclude=exclude)
-        removed_domains = self.remove_old_domains(domain_configs, container)
-        updated_domains = self.update_domain_config(domain_configs, container)
+        if trusted:
+            removed_domains = self.remove_domains(gone, container)
+        else:
+            removed_domains = self.remove_old_domains(
+                domain_configs, container
+            )
+        updated_domains = self.update_domain_config(changed, container)
+        self._state.domain_digests = digests
         if removed_domains or updated_domains:
+            # Domain CA files are also part of the system trust store.
+            self.keystone_manager.write_combined_ca()
             ph = self.get_named_pebble_handler(KEYSTONE_CONTAINER)
             ph.start_all(restart=True)
 
+    def remove_domains(
+        self, domains: Iterable[str], container: ops.model.Container
+    ) -> List[str]:
+        """Remove the configuration and CA files of domains."""
+        removed_domains = []
+        for domain_name in domains:
+            for path in (
+                self.domain_config_dir / f"keystone.{domain_name}.conf",
+                self.domain_ca_dir / f"keystone.{domain_name}.crt",
+            ):
+                try:
+                    container.remove_path(path)
+                except ops.pebble.PathError:
+                    logger.debug(f"{path} already removed")
+            removed_domains.append(domain_name)
+        return removed_domains
+
     def check_outstanding_identity_ops_requests(self) -> None:
         """Check requests from identity ops relation."""
-        for relation in self.framework.model.relations[
-            self.IDOPS_RELATION_NAME
-        ]:
+        for relation in self.request_queue.pending(self.IDOPS_RELATION_NAME):
             app_data = relation.data[relation.app]
             request = {}
             response = {}
@@ -2262,6 +2447,7 @@ export OS_AUTH_VERSION=3
                     f" for request id {request_id}"
                 )
                 self.handle_op_request(relation.id, relation.name, request)
+            self.request_queue.done(relation)
 
     def check_outstanding_identity_endpoints_requests(self, force=False):
         """Check requests from identity endpoints relation.
@@ -2269,10 +2455,14 @@ export OS_AUTH_VERSION=3
         If force flag is True, process identity services on all
         the connected relations even if its already processed.
         """
-        for relation in self.framework.model.relations[
-            self.IDENDP_RELATION_NAME
-        ]:
-            if not force and relation.data[self.app].get("endpoints"):
+        for relation in self.request_queue.pending(
+            self.IDENDP_RELATION_NAME, force
+        ):
+            if (
+                not force
+                and not self.request_queue.inputs_changed(relation)
+                and relation.data[self.app].get("endpoints")
+            ):
                 logger.debug(
                     "Identity endpoints request already processed for "
                     f"{relation.app.name} {relation.name}/{relation.id}"
@@ -2287,9 +2477,39 @@ export OS_AUTH_VERSION=3
                     relation.name,
                     relation.app.name,
                 )
+            self.request_queue.done(relation)
+
+    @functools.cached_property
+    def request_queue(self) -> request_queue.RequestQueue:
+        """Client requests not yet processed by the leader."""
+        return request_queue.RequestQueue(
+            self.peers,
+            OUTSTANDING_REQUESTS_BUDGET,
+            self.request_inputs,
+        )
 
-    def check_outstanding_requests(self) -> bool:
-        """Process any outstanding client requests."""
+    def request_inputs(self, relation_name: str) -> Dict[str, str]:
+        """Local inputs the responses to client requests depend on."""
+        if relation_name == self.IDOPS_RELATION_NAME:
+            return {}
+        inputs = {
+            "region": self.model.config["region"],
+            "admin-role": self.admin_role,
+            "service-project": self.service_project,
+        }
+        if relation_name == self.IDENDP_RELATION_NAME:
+            relation_name = self.IDSVC_RELATION_NAME
+        inputs.update(self._endpoint_fields().get(relation_name, {}))
+        return inputs
+
+    def check_outstanding_requests(self) -> None:
+        """Process any outstanding client requests.
+
+        Only requests which are new or changed since they were last
+        processed, or whose local inputs changed since, are handled.
+        Processing continues in a later hook once the time budget of this
+        hook is spent.
+        """
         logger.debug("Checking for outstanding client requests")
         if not self.can_service_requests():
             return
@@ -2298,6 +2518,17 @@ export OS_AUTH_VERSION=3
         self.check_outstanding_identity_credentials_requests()
         self.check_outstanding_identity_ops_requests()
         self.check_outstanding_identity_endpoints_requests()
+        self.request_queue.save()
+        if self.request_queue.exhausted:
+            logger.info("Outstanding client requests left for a later hook")
+            self.on.outstanding_requests.emit()
+
+    def _on_outstanding_requests(self, event: OutstandingRequestsEvent):
+        """Continue processing outstanding client requests."""
+        if self.request_queue.exhausted:
+            event.defer()
+            return
+        self.check_outstanding_requests()
 
     def retrieve_endpoints_from_event(self, event):
         """Process service request event.
@@ -2430,12 +2661,9 @@ export OS_AUTH_VERSION=3
                     region=region,
                     may_exist=True,
                 )
-            parsed_internal_endpoint = urlparse(self.internal_endpoint)
-            internal_host = parsed_internal_endpoint.hostname
-            internal_protocol = parsed_internal_endpoint.scheme
-            internal_port = parsed_internal_endpoint.port
-            if not internal_port:
-                internal_port = 80 if internal_protocol == "http" else 443
+            internal_host, internal_port, internal_protocol = (
+                self._internal_endpoint_parts()
+            )
             self.id_svc.interface.set_identity_service_credentials(
                 relation_name,
                 relation_id,
@@ -2569,6 +2797,17 @@ export OS_AUTH_VERSION=3
 
         return None
 
+    def credentials_revision(self, username: str) -> str | None:
+        """Id and revision of the credentials secret of username."""
+        try:
+            credentials_id = self._retrieve_or_set_secret(username)
+            credentials = self.model.get_secret(id=credentials_id)
+            return f"{credentials_id}/{credentials.get_info().revision}"
+        except SecretNotFoundError:
+            logger.warning(f"Secret for {username} credentials not found")
+
+        return None
+
     @property
     def admin_user(self):
         """Admin User."""
@@ -2801,12 +3040,13 @@ export OS_AUTH_VERSION=3
         self.keystone_bootstrap()
         self.set_leader_ready()
         self.check_outstanding_requests()
+        self.retire_service_users()
         self._handle_certificate_transfers()
 
     def unit_fernet_bootstrapped(self) -> bool:
         """Check if fernet tokens have been setup."""
         try:
-            existing_keys = self.keystone_manager.read_keys(
+            has_keys = self.keystone_manager.has_keys(
                 key_repository="/etc/keystone/fernet-keys"
             )
         except AttributeError:
@@ -2818,7 +3058,7 @@ export OS_AUTH_VERSION=3
             )
             return False
 
-        if existing_keys:
+        if has_keys:
             logger.debug("Keys found")
             return True
         else:
@@ -2840,11 +3080,15 @@ export OS_AUTH_VERSION=3
         self.keystone_manager.write_combined_ca()
         self.keystone_saml.set_requirer_info(event)
         # If the wsgi service was running with no tokens it will be in a
-        # wedged state so restart it.
-        if self.unit_fernet_bootstrapped() and not pre_update_fernet_ready:
-            container = self.unit.get_container(self.wsgi_container_name)
-            container.stop("wsgi-keystone")
-            container.start("wsgi-keystone")
+        # wedged state so reload it. Apache also needs a reload to pick up
+        # changed federation metadata, keys or certificates.
+        wedged = (
+            self.unit_fernet_bootstrapped() and not pre_update_fernet_ready
+        )
+        if wedged or self.keystone_manager.federation_changed:
+            ph = self.get_named_pebble_handler(KEYSTONE_CONTAINER)
+            ph.start_all(restart=True)
+            self.keystone_manager.federation_changed = False
         self.configure_domains(event)
         self._state.unit_bootstrapped = True
 
@@ -2852,11 +3096,72 @@ export OS_AUTH_VERSION=3
         """Determine whether the service has been bootstrapped."""
         return super().bootstrapped() and self.unit_fernet_bootstrapped()
 
+    def _internal_endpoint_parts(self) -> tuple:
+        """Host, port and protocol of the internal endpoint."""
+        parsed_internal_endpoint = urlparse(self.internal_endpoint)
+        internal_host = parsed_internal_endpoint.hostname
+        internal_protocol = parsed_internal_endpoint.scheme
+        internal_port = parsed_internal_endpoint.port
+        if not internal_port:
+            internal_port = 80 if internal_protocol == "http" else 443
+        return internal_host, internal_port, internal_protocol
+
+    def _endpoint_fields(self) -> Dict[str, Dict[str, str]]:
+        """Fields published to clients which derive from the endpoints."""
+        internal_host, internal_port, internal_protocol = (
+            self._internal_endpoint_parts()
+        )
+        return {
+            self.IDSVC_RELATION_NAME: {
+                "internal-host": internal_host,
+                "internal-port": str(internal_port),
+                "internal-protocol": internal_protocol,
+                "internal-auth-url": self.internal_endpoint,
+                "admin-auth-url": self.admin_endpoint,
+                "public-auth-url": self.public_endpoint,
+            },
+            self.IDCREDS_RELATION_NAME: {
+                "internal-endpoint": self.internal_endpoint,
+                "public-endpoint": self.public_endpoint,
+            },
+        }
+
+    def publish_endpoint_changes(self) -> None:
+        """Publish changed keystone endpoints to processed client requests.
+
+        Only the fields derived from the keystone endpoints are updated,
+        requests which are not processed yet are left to
+        check_outstanding_requests.
+        """
+        processed_markers = {
+            self.IDSVC_RELATION_NAME: "service-credentials",
+            self.IDCREDS_RELATION_NAME: "credentials",
+        }
+        for relation_name, fields in self._endpoint_fields().items():
+            for relation in self.model.relations[relation_name]:
+                app_data = relation.data[self.app]
+                if not app_data.get(processed_markers[relation_name]):
+                    continue
+                changes = {
+                    key: value
+                    for key, value in fields.items()
+                    if app_data.get(key) != value
+                }
+                if changes:
+                    logger.debug(
+                        f"Publishing {sorted(changes)} to "
+                        f"{relation.app.name} {relation.name}/{relation.id}"
+                    )
+                    app_data.update(changes)
+        if self.model.relations[self.IDENDP_RELATION_NAME]:
+            self.notify_identity_endpoint_relations()
+
     def _ingress_changed(self, event: ops.framework.EventBase) -> None:
         """Ingress changed callback.
 
         Invoked when the data on the ingress relation has changed. This will call
-        configure_charm, then update the keystone endpoints.
+        configure_charm, then update the keystone endpoints and the fields
+        published to clients which depend on them.
         """
         logger.debug("Received an ingress_changed event")
         self.configure_charm(event)
@@ -2864,8 +3169,7 @@ export OS_AUTH_VERSION=3
             self.keystone_manager.update_service_catalog_for_keystone()
 
         if self.can_service_requests():
-            self.check_outstanding_identity_service_requests(force=True)
-            self.check_outstanding_identity_credentials_requests(force=True)
+            self.publish_endpoint_changes()
 
     def _is_keystone_service_ready(self) -> bool:
         """Return True if Pebble and Keystone service are ready."""
@@ -2925,28 +3229,30 @@ export OS_AUTH_VERSION=3
         context = defaultdict(list)
 
         request = self._sanitize_secrets(request)
-        for idx, op in enumerate(request.get("ops", [])):
-            func_name = op.get("name")
-            try:
-                func = getattr(self.keystone_manager.ksclient, func_name)
-                params = op.get("params", {})
-                computed_params = params.copy()
-                for key, value in params.items():
-                    if isinstance(value, str):
-                        templated_value = jinja2.Template(value).render(
-                            context
-                        )
-                        logger.debug(
-                            f"handle_op_request: {value} templated to {templated_value}"
-                        )
-                        computed_params[key] = templated_value
-                result = func(**computed_params)
-                response["ops"][idx]["return-code"] = 0
-                response["ops"][idx]["value"] = result
-            except Exception as e:
-                response["ops"][idx]["return-code"] = -1
-                response["ops"][idx]["value"] = repr(e)
-            context[func_name].append(response["ops"][idx]["value"])
+        ksclient = self.keystone_manager.ksclient
+        with ksclient.cached_lookups():
+            for idx, op in enumerate(request.get("ops", [])):
+                func_name = op.get("name")
+                try:
+                    func = getattr(ksclient, func_name)
+                    params = op.get("params", {})
+                    computed_params = params.copy()
+                    for key, value in params.items():
+                        if isinstance(value, str):
+                            templated_value = _compile_op_template(
+                                value
+                            ).render(context)
+                            logger.debug(
+                                f"handle_op_request: {value} templated to {templated_value}"
+                            )
+                            computed_params[key] = templated_value
+                    result = func(**computed_params)
+                    response["ops"][idx]["return-code"] = 0
+                    response["ops"][idx]["value"] = result
+                except Exception as e:
+                    response["ops"][idx]["return-code"] = -1
+                    response["ops"][idx]["value"] = repr(e)
+                context[func_name].append(response["ops"][idx]["value"])
 
         logger.debug(f"handle_op_request: Sending response {response}")
         self.ops_svc.interface.set_ops_response(
@@ -14,8 +14,10 @@
 
 """Helper functions to interact with keystone."""
 
+import contextlib
 import logging
 from typing import (
+    Iterator,
     Optional,
     Union,
 )
@@ -56,6 +58,54 @@ class KeystoneClient:
 
     def __init__(self, api: Client):
         self.api = api
+        self._cache_lookups = False
+        self._domains: Optional[list] = None
+        self._projects: dict[Optional[str], Optional[list]] = {}
+        self._roles: dict[Optional[str], Optional[list]] = {}
+
+    @contextlib.contextmanager
+    def cached_lookups(self) -> Iterator["KeystoneClient"]:
+        """Reuse domain, project and role lookups within the context.
+
+        Most operations resolve a domain, project or role by name or id,
+        each lookup listing all of them. Within this context each list is
+        fetched once, per domain for projects and roles, and only refreshed
+        after an item of the list is created, updated or deleted.
+        """
+        self._cache_lookups = True
+        try:
+            yield self
+        finally:
+            self._cache_lookups = False
+            self._domains = None
+            self._projects = {}
+            self._roles = {}
+
+    def _list_domains(self) -> Optional[list]:
+        if self._cache_lookups and self._domains is not None:
+            return self._domains
+        domains = self.api.domains.list()
+        if self._cache_lookups:
+            self._domains = domains
+        return domains
+
+    def _list_projects(self, domain: Optional[Domain]) -> Optional[list]:
+        key = domain.id if domain else None
+        if self._cache_lookups and key in self._projects:
+            return self._projects[key]
+        projects = self.api.projects.list(domain=domain)
+        if self._cache_lookups:
+            self._projects[key] = projects
+        return projects
+
+    def _list_roles(self, domain: Optional[Domain]) -> Optional[list]:
+        key = domain.id if domain else None
+        if self._cache_lookups and key in self._roles:
+            return self._roles[key]
+        roles = self.api.roles.list(domain=domain)
+        if self._cache_lookups:
+            self._roles[key] = roles
+        return roles
 
     def _convert_endpoint_to_dict(self, endpoint: Endpoint) -> dict:
         return {
@@ -115,7 +165,7 @@ class KeystoneClient:
         if identifier is None:
             return None
 
-        domains = self.api.domains.list()
+        domains = self._list_domains()
         logger.debug(f"Domains list: {domains}")
         if domains is None:
             return None
@@ -152,7 +202,7 @@ class KeystoneClient:
         if not isinstance(domain, Domain):
             domain = self.get_domain_object(domain)
 
-        projects = self.api.projects.list(domain=domain)
+        projects = self._list_projects(domain)
         logger.debug(f"Projects list in domain {domain}: {projects}")
         if projects is None:
             return None
@@ -256,7 +306,7 @@ class KeystoneClient:
         if not isinstance(domain, Domain):
             domain = self.get_domain_object(domain)
 
-        roles = self.api.roles.list(domain=domain)
+        roles = self._list_roles(domain)
         logger.debug(f"Roles list in domain {domain}: {roles}")
         if roles is None:
             return None
@@ -430,7 +480,7 @@ class KeystoneClient:
         :param type: str | None
         :rtype: list
         """
-        domains = self.api.domains.list()
+        domains = self._list_domains()
         domains_list = []
 
         if name:
@@ -512,6 +562,7 @@ class KeystoneClient:
         domain = self.api.domains.create(
             name=name, description=description, enabled=enable
         )
+        self._domains = None
         logger.debug(f"Created domain {name} with id {domain.id}")
         return self._convert_domain_to_dict(domain)
 
@@ -552,6 +603,7 @@ class KeystoneClient:
         updated_domain = self.api.domains.update(
             domain_object, name=name, description=description, enabled=enable
         )
+        self._domains = None
         logger.debug(f"Updated domain {updated_domain}")
         return self._convert_domain_to_dict(updated_domain)
 
@@ -562,6 +614,7 @@ class KeystoneClient:
         :type name: str
         """
         self.api.domains.delete(domain=name)
+        self._domains = None
         logger.debug(f"Deleted domain {name}")
 
     def list_project(self, domain: Optional[str] = None) -> list:
@@ -586,7 +639,7 @@ class KeystoneClient:
         :rtype: list
         """
         domain = self.get_domain_object(domain)
-        projects = self.api.projects.list(domain=domain)
+        projects = self._list_projects(domain)
         project_list = [
             self._convert_project_to_dict(project) for project in projects
         ]
@@ -667,6 +720,7 @@ class KeystoneClient:
         project = self.api.projects.create(
             name=name, description=description, domain=domain
         )
+        self._projects = {}
         logger.debug(f"Created project {name} with id {project.id}")
         return self._convert_project_to_dict(project)
 
@@ -716,6 +770,7 @@ class KeystoneClient:
             description=description,
             enabled=enable,
         )
+        self._projects = {}
         logger.debug(f"Updated project {updated_project}")
         return self._convert_project_to_dict(updated_project)
 
@@ -733,6 +788,7 @@ class KeystoneClient:
             raise KeystoneExceptionError(f"Project {name} does not exist")
 
         self.api.projects.delete(project_object)
+        self._projects = {}
         logger.debug(f"Deleted project {name} with id {project_object.id}")
 
     def list_user(
@@ -992,7 +1048,7 @@ class KeystoneClient:
         :rtype: list
         """
         domain_object = self.get_domain_object(domain)
-        roles = self.api.roles.list(domain=domain_object)
+        roles = self._list_roles(domain_object)
         role_list = [self._convert_role_to_dict(role) for role in roles]
         logger.debug(f"Roles list: {role_list}")
         return role_list
@@ -1030,6 +1086,7 @@ class KeystoneClient:
 
         domain_object = self.get_domain_object(domain)
         role = self.api.roles.create(name=name, domain=domain_object)
+        self._roles = {}
         logger.debug(f"Created role {name} with id {role.id}.")
         return self._convert_role_to_dict(role)
 
@@ -1063,6 +1120,7 @@ class KeystoneClient:
             raise KeystoneExceptionError(f"Role {role} does not exist")
 
         updated_role = self.api.roles.update(role_object, name=name)
+        self._roles = {}
         logger.debug(f"Updated role {updated_role}")
         return self._convert_role_to_dict(updated_role)
 
@@ -1080,6 +1138,7 @@ class KeystoneClient:
         """
         role = self.get_role_object(name, domain=domain)
         self.api.roles.delete(role)
+        self._roles = {}
         logger.debug(f"Deleted role {name}")
 
     def grant_role(
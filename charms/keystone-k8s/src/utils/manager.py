@@ -14,8 +14,13 @@
 
 """Manager for interacting with keystone."""
 
+import hashlib
+import json
 import logging
+import os
 from typing import (
+    Any,
+    Callable,
     Mapping,
     Optional,
 )
@@ -45,6 +50,19 @@ _OIDC_METADATA_FOLDER = "/etc/apache2/oidc-metadata"
 _KEYSTONE_COMBINED_CA = (
     "/usr/local/share/ca-certificates/keystone-combined.crt"
 )
+# Digest of the combined CA the trust store was last refreshed with. Kept
+# out of the CA directory, where files of unrelated domains are removed.
+_KEYSTONE_COMBINED_CA_DIGEST = "/etc/keystone/keystone-combined-ca.sha256"
+FERNET_KEY_REPOSITORY = "/etc/keystone/fernet-keys"
+CREDENTIAL_KEY_REPOSITORY = "/etc/keystone/credential-keys"
+# keystone-manage command initialising each key repository.
+_KEY_REPOSITORY_SETUP = {
+    FERNET_KEY_REPOSITORY: "fernet_setup",
+    CREDENTIAL_KEY_REPOSITORY: "credential_setup",
+}
+# Peer application data key holding the digest of the inputs of each
+# completed bootstrap step.
+BOOTSTRAP_CHECKPOINTS_KEY = "bootstrap-checkpoints"
 SAML_METADATA_FOLDER = "/etc/apache2/saml2-metadata"
 SAML_PROVIDER_FOLDER = f"{SAML_METADATA_FOLDER}/providers"
 SAML_KEY_PATH = f"{SAML_METADATA_FOLDER}/saml_sp_key.pem"
@@ -64,6 +82,17 @@ class KeystoneManager:
         self.container_name = container_name
         self._api = None
         self._ksclient = None
+        # Key files listed and keys read from the key repositories during
+        # this hook.
+        self._key_files: dict[str, list[ops.pebble.FileInfo]] = {}
+        self._keys: dict[str, dict[str, str]] = {}
+        # Metadata folders ensured and federation assets synced during this
+        # hook, the latter by digest of the assets.
+        self._metadata_folders: set[str] = set()
+        self._federation_assets: dict[str, str] = {}
+        # Whether federation assets changed on disk during this hook, apache
+        # needs a reload to pick them up.
+        self.federation_changed = False
 
     def run_cmd(self, cmd, exception_on_error=True, **kwargs):
         """Run command in container."""
@@ -135,14 +164,118 @@ class KeystoneManager:
         keystone service.
         """
         with sunbeam_guard.guard(self.charm, "Initializing Keystone", False):
-            self._fernet_setup()
-            self._credential_setup()
-            self._bootstrap()
+            self._key_repositories_setup()
+            self._run_bootstrap_step(
+                "bootstrap",
+                self._bootstrap_inputs(),
+                self._bootstrap,
+            )
+
+    def _bootstrap_checkpoints(self) -> dict[str, str]:
+        """Digests of the inputs of the completed bootstrap steps."""
+        checkpoints = self.charm.peers.get_app_data(BOOTSTRAP_CHECKPOINTS_KEY)
+        return json.loads(checkpoints) if checkpoints else {}
+
+    def _run_bootstrap_step(
+        self,
+        step: str,
+        inputs: Mapping[str, Any],
+        func: Callable[[], None],
+        verify: Callable[[], bool] | None = None,
+    ) -> bool:
+        """Run the bootstrap step unless it completed with the same inputs.
+
+        Completed steps are checkpointed in the peer application data, so
+        that a failed bootstrap resumes from the step which failed and later
+        hooks skip it altogether. If given, verify confirms that the results
+        of a checkpointed step are still present before it is skipped.
+
+        :returns: whether the step was run.
+        """
+        digest = hashlib.sha256(
+            json.dumps(inputs, sort_keys=True).encode()
+        ).hexdigest()
+        checkpoints = self._bootstrap_checkpoints()
+        if checkpoints.get(step) == digest and (verify is None or verify()):
+            logger.debug(f"Bootstrap step {step} already completed")
+            return False
+        func()
+        checkpoints[step] = digest
+        self.charm.peers.set_app_data(
+            {
+                BOOTSTRAP_CHECKPOINTS_KEY: json.dumps(
+                    checkpoints, sort_keys=True
+                )
+            }
+        )
+        return True
 
-    def _ensure_metadata_folder(self, pth: str) -> None:
-        self.run_cmd(["sudo", "mkdir", "-p", pth])
-        self.run_cmd(["sudo", "chown", "keystone:www-data", pth])
-        self.run_cmd(["sudo", "chmod", "550", pth])
+    def _bootstrap_inputs(self) -> dict[str, Any]:
+        """Inputs of keystone-manage bootstrap.
+
+        Passwords are identified by the id and revision of their secret,
+        so that they are not exposed in the peer data.
+        """
+        database = None
+        handler = self.charm.dbs.get("database")
+        relation = handler.get_relation() if handler else None
+        if relation:
+            database = [
+                relation.id,
+                handler.get_relation_data().get("endpoints"),
+            ]
+        return {
+            "user": self.charm.charm_user,
+            "password": self.charm.credentials_revision(self.charm.charm_user),
+            "role": self.charm.admin_role,
+            "endpoints": [
+                self.admin_endpoint,
+                self.public_endpoint,
+                self.internal_endpoint,
+            ],
+            "region": self.regions[0],
+            "database": database,
+        }
+
+    def _ensure_metadata_folder(self, *paths: str) -> None:
+        """Create the metadata folders with their permissions, once per hook.
+
+        Folders which already exist with the expected ownership and
+        permissions are left alone, the others are set up with a single
+        command.
+        """
+        container = self.charm.unit.get_container(self.container_name)
+        pending = []
+        for path in paths:
+            if path in self._metadata_folders:
+                continue
+            try:
+                info = container.list_files(path, itself=True)[0]
+            except (ops.pebble.APIError, ops.pebble.PathError):
+                pending.append(path)
+                continue
+            if (info.user, info.group, info.permissions) != (
+                "keystone",
+                "www-data",
+                0o550,
+            ):
+                pending.append(path)
+        if pending:
+            self.run_cmd(
+                [
+                    "sudo",
+                    "install",
+                    "-d",
+                    "-o",
+                    "keystone",
+                    "-g",
+                    "www-data",
+                    "-m",
+                    "550",
+                    *pending,
+                ]
+            )
+        self._metadata_folders.update(paths)
 
     def setup_oidc_metadata_folder(self):
         """Create the OIDC metadata folder and set permissions."""
@@ -150,8 +283,9 @@ class KeystoneManager:
 
     def setup_saml2_metadata_folder(self):
         """Create the SAML2 metadata folder and set permissions."""
-        self._ensure_metadata_folder(SAML_METADATA_FOLDER)
-        self._ensure_metadata_folder(SAML_PROVIDER_FOLDER)
+        self._ensure_metadata_folder(
+            SAML_METADATA_FOLDER, SAML_PROVIDER_FOLDER
+        )
 
     def rotate_fernet_keys(self):
         """Rotate the fernet keys.
@@ -164,6 +298,7 @@ class KeystoneManager:
         (token-expiration + allow-expired-window)/(fernet-max-active-keys - 2)
         """
         with sunbeam_guard.guard(self.charm, "Rotating fernet keys"):
+            self._forget_keys(FERNET_KEY_REPOSITORY)
             self.run_cmd(
                 [
                     "sudo",
@@ -185,6 +320,7 @@ class KeystoneManager:
         https://docs.openstack.org/keystone/latest/admin/credential-encryption.html
         """
         with sunbeam_guard.guard(self.charm, "Rotating credential keys"):
+            self._forget_keys(CREDENTIAL_KEY_REPOSITORY)
             self.run_cmd(
                 [
                     "sudo",
@@ -212,12 +348,63 @@ class KeystoneManager:
                 ]
             )
 
+    def _read_combined_ca_digest(
+        self, container: ops.model.Container
+    ) -> Optional[str]:
+        """Digest of the combined CA the trust store was refreshed with."""
+        try:
+            return container.pull(_KEYSTONE_COMBINED_CA_DIGEST).read()
+        except (ops.pebble.PathError, FileNotFoundError):
+            return None
+
+    def _domain_ca_files(self, container: ops.model.Container) -> list:
+        """Name, size and modification time of the domain CA files."""
+        try:
+            files = container.list_files(
+                self.charm.domain_ca_dir, pattern="keystone.*.crt"
+            )
+        except (ops.pebble.APIError, ops.pebble.PathError):
+            return []
+        return sorted(
+            [f.name, f.size, f.last_modified.isoformat()] for f in files
+        )
+
+    @staticmethod
+    def _trust_store_digest(contents: str, domain_ca_files: list) -> str:
+        """Digest of the CAs the trust store is built from."""
+        return hashlib.sha256(
+            json.dumps(
+                {"combined": contents, "domains": domain_ca_files},
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+
     def write_combined_ca(self) -> None:
-        """Write the combined CA to the container."""
+        """Write the combined CA to the container.
+
+        The trust store is only refreshed when the combined CA or the CA
+        files of the domains changed since it was last refreshed. Adding
+        CAs is done incrementally, replacing or removing them needs a
+        fresh rebuild to drop the links to the previous certificates. Without
+        a recorded digest the previous state is unknown, so the trust store
+        is rebuilt afresh as well.
+        """
         ca_contents = self.charm.get_ca_and_chain()
         oauth_ca_certs = self.charm.get_ca_bundles_from_fid_relations()
+        combined = []
+        if ca_contents:
+            combined.append(ca_contents)
+        if oauth_ca_certs:
+            combined.extend(oauth_ca_certs)
+        contents = "\n".join(combined)
         container = self.charm.unit.get_container(self.container_name)
-        if not ca_contents and not oauth_ca_certs:
+        domain_ca_files = self._domain_ca_files(container)
+        digest = self._trust_store_digest(contents, domain_ca_files)
+        previous_digest = self._read_combined_ca_digest(container)
+        if previous_digest == digest:
+            logger.debug("Combined CA unchanged, not refreshing trust store.")
+            return
+        if not contents:
             logger.debug(
                 "No CA contents found to write to keystone container."
             )
@@ -227,25 +414,75 @@ class KeystoneManager:
             except ops.pebble.PathError:
                 logger.debug("No existing CA file to remove.")
         else:
-            combined = []
-            if ca_contents:
-                combined.append(ca_contents)
-            if oauth_ca_certs:
-                combined.extend(oauth_ca_certs)
             container.push(
                 _KEYSTONE_COMBINED_CA,
-                "\n".join(combined),
+                contents,
                 user="root",
                 group="root",
                 permissions=0o644,
             )
-        self.run_cmd(["sudo", "update-ca-certificates", "--fresh"])
+        empty_digest = self._trust_store_digest("", [])
+        if (contents or domain_ca_files) and previous_digest == empty_digest:
+            self.run_cmd(["sudo", "update-ca-certificates"])
+        else:
+            self.run_cmd(["sudo", "update-ca-certificates", "--fresh"])
+        container.push(
+            _KEYSTONE_COMBINED_CA_DIGEST,
+            digest,
+            user="root",
+            group="root",
+            permissions=0o644,
+        )
+
+    @staticmethod
+    def _list_metadata_files(
+        container: ops.model.Container, meta_folder: str
+    ) -> list[ops.pebble.FileInfo]:
+        """List the files in meta_folder, none if it does not exist."""
+        try:
+            return [
+                file
+                for file in container.list_files(meta_folder)
+                if file.type == ops.pebble.FileType.FILE
+            ]
+        except (ops.pebble.APIError, ops.pebble.PathError):
+            return []
 
     def _write_metadata_files(
         self, metadata: Mapping[str, str], meta_folder: str
-    ) -> None:
+    ) -> bool:
+        """Sync the files of meta_folder with metadata.
+
+        The digests of the files written are kept in a manifest, only the
+        files which differ from it are pushed and the files not part of
+        metadata are removed. The manifest is not trusted if the names of
+        the files on disk do not match it, e.g. after a container restart,
+        and a file is pushed again if its size on disk is not the expected
+        one.
+
+        :returns: whether any file was changed.
+        """
+        digests = self._key_digests(metadata)
+        synced = hashlib.sha256(
+            json.dumps(digests, sort_keys=True).encode()
+        ).hexdigest()
+        if self._federation_assets.get(meta_folder) == synced:
+            return False
+
         container = self.charm.unit.get_container(self.container_name)
+        files = self._list_metadata_files(container, meta_folder)
+        sizes = {file.name: file.size for file in files}
+        manifests = dict(self.charm._state.federation_manifests)  # noqa
+        manifest = manifests.get(meta_folder, {})
+        if set(sizes) != set(manifest):
+            manifest = {}
+
+        changed = False
         for filename, contents in metadata.items():
+            if manifest.get(filename) == digests[filename] and sizes.get(
+                filename
+            ) == len(contents.encode()):
+                continue
             container.push(
                 f"{meta_folder}/{filename}",
                 contents,
@@ -253,68 +490,132 @@ class KeystoneManager:
                 group="www-data",
                 permissions=0o440,
             )
+            changed = True
 
         # remove old metadata files
-        files = container.list_files(meta_folder)
         for file in files:
             if file.name not in metadata:
                 container.remove_path(file.path)
-
-    def write_oidc_metadata(self, metadata: Mapping[str, str]) -> None:
+                changed = True
+
+        if manifest != digests:
+            manifests[meta_folder] = digests
+            self.charm._state.federation_manifests = manifests  # noqa
+        self._federation_assets[meta_folder] = synced
+        if changed:
+            logger.debug(f"Federation assets changed in {meta_folder}")
+            self.federation_changed = True
+        return changed
+
+    def write_oidc_metadata(self, metadata: Mapping[str, str]) -> bool:
         """Write the OIDC metadata to the container."""
-        self._write_metadata_files(metadata, _OIDC_METADATA_FOLDER)
+        return self._write_metadata_files(metadata, _OIDC_METADATA_FOLDER)
 
-    def write_saml_metadata(self, metadata: Mapping[str, str]) -> None:
+    def write_saml_metadata(self, metadata: Mapping[str, str]) -> bool:
         """Write the SAML2 metadata to the container."""
         self.setup_saml2_metadata_folder()
-        self._write_metadata_files(metadata, SAML_PROVIDER_FOLDER)
+        return self._write_metadata_files(metadata, SAML_PROVIDER_FOLDER)
 
-    def remove_saml_key_and_cert(self):
+    def remove_saml_key_and_cert(self) -> bool:
         """Removes the SAML2 SP key and cert."""
-        self.run_cmd(["sudo", "rm", "-f", SAML_KEY_PATH])
-        self.run_cmd(["sudo", "rm", "-f", SAML_CERT_PATH])
+        return self._write_metadata_files({}, SAML_METADATA_FOLDER)
 
-    def ensure_saml_cert_and_key_state(self, cert: str, key: str) -> None:
+    def ensure_saml_cert_and_key_state(self, cert: str, key: str) -> bool:
         """Ensure that the SAML cert and key are written to disk."""
         if not key or not cert:
             raise ValueError("key and cert are mandatory")
 
         self.setup_saml2_metadata_folder()
-        container = self.charm.unit.get_container(self.container_name)
-        container.push(
-            SAML_KEY_PATH,
-            key,
-            user="keystone",
-            group="www-data",
-            permissions=0o440,
-        )
-        container.push(
-            SAML_CERT_PATH,
-            cert,
-            user="keystone",
-            group="www-data",
-            permissions=0o440,
+        return self._write_metadata_files(
+            {
+                os.path.basename(SAML_KEY_PATH): key,
+                os.path.basename(SAML_CERT_PATH): cert,
+            },
+            SAML_METADATA_FOLDER,
         )
 
-    def read_keys(self, key_repository: str) -> Mapping[str, str]:
-        """Pull the fernet keys from the on-disk repository."""
-        container = self.charm.unit.get_container(self.container_name)
-        files = container.list_files(key_repository)
-        # Ignore file type directory. This is to ignore lost+found directory
+    @staticmethod
+    def _key_digests(keys: Mapping[str, str]) -> dict[str, str]:
         return {
-            file.name: container.pull(file.path).read()
-            for file in files
-            if file.type == ops.pebble.FileType.FILE
+            name: hashlib.sha256(contents.encode()).hexdigest()
+            for name, contents in keys.items()
         }
 
+    def _key_manifest(self, key_repository: str) -> dict[str, str]:
+        """Digests of the keys this unit last wrote to key_repository."""
+        manifests = self.charm._state.key_manifests  # noqa
+        return dict(manifests.get(key_repository, {}))
+
+    def _set_key_manifest(
+        self, key_repository: str, keys: Mapping[str, str]
+    ) -> None:
+        manifests = dict(self.charm._state.key_manifests)  # noqa
+        manifests[key_repository] = self._key_digests(keys)
+        self.charm._state.key_manifests = manifests  # noqa
+
+    def _forget_keys(self, key_repository: str) -> None:
+        """Forget what is known of key_repository, e.g. before a rotation."""
+        self._key_files.pop(key_repository, None)
+        self._keys.pop(key_repository, None)
+        manifests = dict(self.charm._state.key_manifests)  # noqa
+        if manifests.pop(key_repository, None) is not None:
+            self.charm._state.key_manifests = manifests  # noqa
+
+    def _list_key_files(
+        self, key_repository: str
+    ) -> list[ops.pebble.FileInfo]:
+        """List the key files in key_repository, once per hook."""
+        if key_repository not in self._key_files:
+            container = self.charm.unit.get_container(self.container_name)
+            # Ignore file type directory. This is to ignore lost+found
+            # directory
+            self._key_files[key_repository] = [
+                file
+                for file in container.list_files(key_repository)
+                if file.type == ops.pebble.FileType.FILE
+            ]
+        return self._key_files[key_repository]
+
+    def has_keys(self, key_repository: str) -> bool:
+        """Whether there are keys in the on-disk repository."""
+        return bool(self._list_key_files(key_repository))
+
+    def read_keys(self, key_repository: str) -> Mapping[str, str]:
+        """Pull the fernet keys from the on-disk repository."""
+        if key_repository not in self._keys:
+            container = self.charm.unit.get_container(self.container_name)
+            keys = {
+                file.name: container.pull(file.path).read()
+                for file in self._list_key_files(key_repository)
+            }
+            self._keys[key_repository] = keys
+            self._set_key_manifest(key_repository, keys)
+        return dict(self._keys[key_repository])
+
     def write_keys(self, key_repository: str, keys: Mapping[str, str]) -> None:
-        """Update the local fernet key repository with the provided keys."""
+        """Update the local fernet key repository with the provided keys.
+
+        Only the keys which differ from the manifest of the repository are
+        pushed, and only the files which are not part of keys are removed.
+        """
         container = self.charm.unit.get_container(self.container_name)
+        files = self._list_key_files(key_repository)
+        manifest = self._key_manifest(key_repository)
+        if {file.name for file in files} != set(manifest):
+            # The repository changed under us, do not trust the manifest.
+            manifest = {}
 
         logger.debug(f"Writing updated fernet keys at {key_repository}")
 
-        # write the keys
-        for filename, contents in keys.items():
+        # write the keys, the staged key last: the previous staged key is
+        # the primary key of the unit which rotated them, overwriting it
+        # first would fail the tokens it issues until the rest is written.
+        digests = self._key_digests(keys)
+        for filename, contents in sorted(
+            keys.items(), key=lambda item: item[0] == "0"
+        ):
+            if manifest.get(filename) == digests[filename]:
+                continue
             container.push(
                 f"{key_repository}/{filename}",
                 contents,
@@ -324,11 +625,33 @@ class KeystoneManager:
             )
 
         # remove old keys
-        files = container.list_files(key_repository)
         for file in files:
             if file.name not in keys:
                 container.remove_path(file.path)
 
+        self._key_files.pop(key_repository, None)
+        self._keys[key_repository] = dict(keys)
+        self._set_key_manifest(key_repository, keys)
+
+    def sync_keys(self, key_repository: str, keys: Mapping[str, str]) -> bool:
+        """Sync the on-disk repository with keys, return True if updated.
+
+        The digests of the keys this unit last wrote or read are kept in a
+        manifest, the repository is only read back when the key files on
+        disk do not match it.
+        """
+        if not keys:
+            return False
+        manifest = self._key_manifest(key_repository)
+        names = {file.name for file in self._list_key_files(key_repository)}
+        if names == set(manifest):
+            if manifest == self._key_digests(keys):
+                return False
+        elif keys == self.read_keys(key_repository):
+            return False
+        self.write_keys(key_repository, keys)
+        return True
+
     def _set_status(self, status: str, app: bool = False) -> None:
         """Sets the status to the specified status string.
 
@@ -375,69 +698,50 @@ class KeystoneManager:
             logger.exception("Error occurred synchronizing the database.")
             raise KeystoneExceptionError("Database sync failed")
 
-    def _fernet_setup(self):
-        """Sets up the fernet token store in the specified container.
+    def _key_repositories_setup(self):
+        """Sets up the fernet token and credential key repositories.
+
+        Repositories which already hold keys are left alone.
 
-        :raises: KeystoneExceptionError when a failure occurs setting up the fernet
-                 token store
+        :raises: KeystoneExceptionError when a failure occurs setting up a key
+                 repository
         """
-        try:
-            self._set_status("Setting up fernet tokens")
-            logger.info("Setting up fernet tokens...")
-            self.run_cmd(
-                [
-                    "sudo",
-                    "chown",
-                    "keystone:keystone",
-                    "/etc/keystone/fernet-keys",
-                ]
-            )
-            self.run_cmd(
-                [
-                    "sudo",
-                    "-u",
-                    "keystone",
-                    "keystone-manage",
-                    "fernet_setup",
-                    "--keystone-user",
-                    "keystone",
-                    "--keystone-group",
-                    "keystone",
-                ]
-            )
-        except ops.pebble.ExecError:
-            logger.exception("Error occurred setting up fernet tokens")
-            raise KeystoneExceptionError("Fernet setup failed.")
+        pending = []
+        for key_repository in _KEY_REPOSITORY_SETUP:
+            try:
+                if self.has_keys(key_repository):
+                    continue
+            except (ops.pebble.APIError, ops.pebble.PathError):
+                logger.debug(f"Cannot list keys in {key_repository}")
+            pending.append(key_repository)
+        if not pending:
+            logger.debug("Key repositories already set up")
+            return
 
-    def _credential_setup(self):
-        """Run keystone credential_setup."""
         try:
-            self._set_status("Setting up credentials")
-            logger.info("Setting up credentials...")
-            self.run_cmd(
-                [
-                    "sudo",
-                    "chown",
-                    "keystone:keystone",
-                    "/etc/keystone/credential-keys",
-                ]
-            )
-            self.run_cmd(
-                [
-                    "sudo",
-                    "-u",
-                    "keystone",
-                    "keystone-manage",
-                    "credential_setup",
-                    "--keystone-user",
-                    "keystone",
-                    "--keystone-group",
-                    "keystone",
-                ]
-            )
+            self._set_status("Setting up fernet tokens and credentials")
+            logger.info(f"Setting up key repositories {pending}...")
+            self.run_cmd(["sudo", "chown", "keystone:keystone", *pending])
+            for key_repository in pending:
+                self.run_cmd(
+                    [
+                        "sudo",
+                        "-u",
+                        "keystone",
+                        "keystone-manage",
+                        _KEY_REPOSITORY_SETUP[key_repository],
+                        "--keystone-user",
+                        "keystone",
+                        "--keystone-group",
+                        "keystone",
+                    ]
+                )
         except ops.pebble.ExecError:
-            logger.exception("Error occurred during credential setup")
-            raise KeystoneExceptionError("Credential setup failed.")
+            logger.exception("Error occurred setting up key repositories.")
+            raise KeystoneExceptionError("Key repositories setup failed.")
+        finally:
+            for key_repository in pending:
+                self._forget_keys(key_repository)
 
     def _bootstrap(self):
         """Run keystone bootstrap."""
@@ -482,9 +786,40 @@ class KeystoneManager:
         with sunbeam_guard.guard(
             self.charm, "Setting up initial projects and users", False
         ):
-            self._setup_admin_accounts()
-            self._setup_service_accounts()
-            self.update_service_catalog_for_keystone()
+            # The ids of the domains and projects are kept in the unit
+            # stored state, a new leader sets them up again.
+            state = self.charm._state  # noqa
+            self._run_bootstrap_step(
+                "initial-projects-and-users",
+                {
+                    "admin-user": self.charm.admin_user,
+                    "admin-password": self.charm.credentials_revision(
+                        self.charm.admin_user
+                    ),
+                    "admin-role": self.charm.admin_role,
+                    "service-project": self.charm.service_project,
+                    "endpoints": [
+                        self.admin_endpoint,
+                        self.public_endpoint,
+                        self.internal_endpoint,
+                    ],
+                    "regions": self.regions,
+                    "bootstrap": self._bootstrap_checkpoints().get(
+                        "bootstrap"
+                    ),
+                },
+                self._setup_initial_projects_and_users,
+                verify=lambda: bool(
+                    state.default_domain_id
+                    and state.admin_domain_id
+                    and state.service_project_id
+                ),
+            )
+
+    def _setup_initial_projects_and_users(self):
+        self._setup_admin_accounts()
+        self._setup_service_accounts()
+        self.update_service_catalog_for_keystone()
 
     def _setup_admin_accounts(self):
         """Setup admin accounts."""
@@ -0,0 +1,149 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Track client requests processed by the leader."""
+
+import hashlib
+import json
+import logging
+import time
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+
+import ops
+import ops_sunbeam.relation_handlers as sunbeam_rhandlers
+
+logger = logging.getLogger(__name__)
+
+PROCESSED_REQUESTS_KEY = "processed-requests"
+
+
+def _digest(data: Mapping[str, Any]) -> str:
+    """Digest of JSON serialisable data."""
+    return hashlib.sha256(
+        json.dumps(data, sort_keys=True).encode()
+    ).hexdigest()
+
+
+class RequestQueue:
+    """Queue of client requests not yet processed by the leader.
+
+    Digests of the remote application data and of the local inputs the
+    response depends on, such as the region or the keystone endpoints,
+    are recorded in the peer application data once a request has been
+    processed, so that any leader only processes requests which are new
+    or changed since. Processing stops once the time budget is spent, the
+    caller is expected to continue in a later hook when `exhausted` is
+    set. The recorded digests are written back by `save`, once per hook.
+    """
+
+    def __init__(
+        self,
+        peers: sunbeam_rhandlers.BasePeerHandler,
+        budget: float,
+        local_inputs: Callable[[str], Mapping[str, Any]],
+    ):
+        self.peers = peers
+        self.deadline = time.monotonic() + budget
+        self.local_inputs = local_inputs
+        self.exhausted = False
+        self._digests: dict[str, dict[str, dict[str, str]]] | None = None
+        self._inputs_digests: dict[str, str] = {}
+        self._dirty = False
+
+    @property
+    def digests(self) -> dict[str, dict[str, dict[str, str]]]:
+        """Digests of processed requests, per relation name and id."""
+        if self._digests is None:
+            processed = self.peers.get_app_data(PROCESSED_REQUESTS_KEY)
+            self._digests = json.loads(processed) if processed else {}
+        return self._digests
+
+    def digest(self, relation: ops.Relation) -> dict[str, str]:
+        """Digests of the request and the local inputs of relation."""
+        if relation.name not in self._inputs_digests:
+            self._inputs_digests[relation.name] = _digest(
+                self.local_inputs(relation.name)
+            )
+        data = dict(relation.data[relation.app]) if relation.app else {}
+        return {
+            "request": _digest(data),
+            "inputs": self._inputs_digests[relation.name],
+        }
+
+    def inputs_changed(self, relation: ops.Relation) -> bool:
+        """Whether local inputs changed since relation was processed."""
+        recorded = self.digests.get(relation.name, {}).get(str(relation.id))
+        return (
+            recorded is not None
+            and recorded.get("inputs") != self.digest(relation)["inputs"]
+        )
+
+    def pending(
+        self, relation_name: str, force: bool = False
+    ) -> Iterator[ops.Relation]:
+        """Yield relations with a new or changed request.
+
+        If force flag is True, all the relations are yielded. The time
+        budget applies in both cases.
+        """
+        relations = self.peers.model.relations[relation_name]
+        for relation in relations:
+            if time.monotonic() > self.deadline:
+                logger.debug(
+                    "Time budget spent, not processing request from "
+                    f"{relation.name}/{relation.id}"
+                )
+                self.exhausted = True
+                return
+            processed = self.digests.get(relation.name, {})
+            if force or processed.get(str(relation.id)) != self.digest(
+                relation
+            ):
+                yield relation
+        self._prune(relation_name, relations)
+
+    def done(self, relation: ops.Relation) -> None:
+        """Record the request on relation as processed."""
+        processed = self.digests.setdefault(relation.name, {})
+        digest = self.digest(relation)
+        if processed.get(str(relation.id)) != digest:
+            processed[str(relation.id)] = digest
+            self._dirty = True
+
+    def _prune(
+        self, relation_name: str, relations: Iterable[ops.Relation]
+    ) -> None:
+        """Forget requests from relations which are gone."""
+        processed = self.digests.get(relation_name, {})
+        ids = {str(relation.id) for relation in relations}
+        stale = [rid for rid in processed if rid not in ids]
+        for rid in stale:
+            del processed[rid]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the recorded digests to the peer application data."""
+        if not self._dirty or not self.peers.model.unit.is_leader():
+            return
+        self._dirty = False
+        self.peers.set_app_data(
+            {PROCESSED_REQUESTS_KEY: json.dumps(self.digests, sort_keys=True)}
+        )
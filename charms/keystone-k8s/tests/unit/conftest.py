@@ -61,6 +61,18 @@ def _keystone_manager_mock():
         "0": "key0data=",
         "1": "key1data=",
     }
+
+    def _sync_keys(key_repository, keys):
+        if keys and keys != km.read_keys(key_repository=key_repository):
+            km.write_keys(key_repository=key_repository, keys=keys)
+            return True
+        return False
+
+    km.sync_keys.side_effect = _sync_keys
+    km.federation_changed = False
+    km.has_keys.side_effect = lambda key_repository: bool(
+        km.read_keys(key_repository=key_repository)
+    )
     return km
 
 
@@ -23,10 +23,15 @@ scenario events and inspecting mock side-effects.
 
 import base64
 import dataclasses
+import datetime
+import io
 import json
 from pathlib import (
     Path,
 )
+from types import (
+    SimpleNamespace,
+)
 from unittest.mock import (
     MagicMock,
     call,
@@ -35,8 +40,11 @@ from unittest.mock import (
 import charm
 import jinja2
 import keystoneauth1.exceptions
+import ops
 import pytest
+import utils.client as client
 import utils.manager as manager
+import utils.request_queue as request_queue
 from ops import (
     testing,
 )
@@ -619,6 +627,54 @@ class TestIngressChanged:
 
         km.update_service_catalog_for_keystone.assert_not_called()
 
+    def test_publishes_endpoint_changes_only(
+        self, ctx, complete_relations, complete_secrets, container, storages
+    ):
+        """Ingress changes update published endpoints without re-registering."""
+        km = charm.manager.KeystoneManager.return_value
+        state_in = testing.State(
+            leader=True,
+            relations=[*complete_relations, _identity_service_relation()],
+            containers=[container],
+            secrets=complete_secrets,
+            storages=storages,
+        )
+        state_mid = _bootstrap(ctx, state_in)
+        id_svc = [
+            r for r in state_mid.relations if r.endpoint == "identity-service"
+        ][0]
+        assert id_svc.local_app_data.get("service-credentials")
+        public_auth_url = id_svc.local_app_data["public-auth-url"]
+        stale = dataclasses.replace(
+            id_svc,
+            local_app_data={
+                **id_svc.local_app_data,
+                "public-auth-url": "http://old-ingress/v3",
+            },
+        )
+        state_stale = dataclasses.replace(
+            state_mid,
+            relations=[
+                stale if r.endpoint == "identity-service" else r
+                for r in state_mid.relations
+            ],
+        )
+
+        km.create_service_account.reset_mock()
+        km.ksclient.create_endpoint.reset_mock()
+        ingress_rel = [
+            r for r in state_stale.relations if r.endpoint == "ingress-public"
+        ][0]
+        ctx2 = _new_ctx()
+        state_out = ctx2.run(
+            ctx2.on.relation_changed(ingress_rel), state_stale
+        )
+
+        id_svc_out = state_out.get_relation(id_svc.id)
+        assert id_svc_out.local_app_data["public-auth-url"] == public_auth_url
+        km.create_service_account.assert_not_called()
+        km.ksclient.create_endpoint.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # Action tests
@@ -1272,6 +1328,58 @@ class TestDomainConfig:
         )
         assert content == expected
 
+    def test_domain_config_unchanged(
+        self, ctx, complete_relations, complete_secrets, container, storages
+    ):
+        """Only domains whose config changed are updated."""
+        km = charm.manager.KeystoneManager.return_value
+        dc_rel = _domain_config_relation()
+        state_in = testing.State(
+            leader=True,
+            relations=[*complete_relations, dc_rel],
+            containers=[container],
+            secrets=complete_secrets,
+            storages=storages,
+        )
+        state_mid = _bootstrap(ctx, state_in)
+        dc_out = [
+            r for r in state_mid.relations if r.endpoint == "domain-config"
+        ][0]
+
+        km.ksclient.get_domain_object.reset_mock()
+        ctx2 = _new_ctx()
+        state_out = ctx2.run(ctx2.on.relation_changed(dc_out), state_mid)
+        km.ksclient.get_domain_object.assert_not_called()
+        cleanup_database_requires_events()
+
+        config = base64.b64encode(b"[ldap]\nurl = ldap://10.0.0.1").decode()
+        dc_changed = dataclasses.replace(
+            dc_out,
+            remote_app_data={
+                **dc_out.remote_app_data,
+                "config-contents": config,
+            },
+        )
+        state_changed = dataclasses.replace(
+            state_out,
+            relations=[
+                dc_changed if r.endpoint == "domain-config" else r
+                for r in state_out.relations
+            ],
+        )
+        ctx3 = _new_ctx()
+        ctx3.run(ctx3.on.relation_changed(dc_changed), state_changed)
+        km.ksclient.get_domain_object.assert_called_once_with("mydomain")
+
+    def test_domain_of_file(self):
+        """Domain names containing dots are parsed from file names."""
+        domain_of_file = charm.KeystoneOperatorCharm._domain_of_file
+        assert domain_of_file("keystone.mydomain.conf") == "mydomain"
+        assert domain_of_file("keystone.example.com.conf") == "example.com"
+        assert domain_of_file("keystone.example.com.crt") == "example.com"
+        assert domain_of_file("keystone..conf") is None
+        assert domain_of_file("ca-bundle.crt") is None
+
 
 # ---------------------------------------------------------------------------
 # Crypto fixtures for certificate testing
@@ -2068,6 +2176,461 @@ class TestGetCaAndChain:
             assert ca_pem in result
 
 
+class TestWriteCombinedCa:
+    """Test write_combined_ca only refreshes the trust store on change."""
+
+    @staticmethod
+    def _manager(ca_contents, fid_bundles):
+        files = {}
+
+        def _pull(path):
+            if path not in files:
+                raise FileNotFoundError(path)
+            return io.StringIO(files[path])
+
+        def _push(path, contents, **kwargs):
+            files[path] = contents
+
+        container = MagicMock()
+        container.pull.side_effect = _pull
+        container.push.side_effect = _push
+
+        def _remove_path(path):
+            if path not in files:
+                raise ops.pebble.PathError("not-found", path)
+            del files[path]
+
+        container.remove_path.side_effect = _remove_path
+        charm_mock = MagicMock()
+        charm_mock.unit.get_container.return_value = container
+        charm_mock.get_ca_and_chain.return_value = ca_contents
+        charm_mock.get_ca_bundles_from_fid_relations.return_value = fid_bundles
+        km = KEYSTONE_MANAGER.__new__(KEYSTONE_MANAGER)
+        km.charm = charm_mock
+        km.container_name = "keystone"
+        km.run_cmd = MagicMock()
+        return km, files
+
+    def test_refreshes_only_on_change(self):
+        """Trust store is rebuilt when the combined CA changes only."""
+        km, files = self._manager("ca", ["fid-ca"])
+
+        km.write_combined_ca()
+        assert files[manager._KEYSTONE_COMBINED_CA] == "ca\nfid-ca"
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+        km.run_cmd.reset_mock()
+        km.write_combined_ca()
+        km.run_cmd.assert_not_called()
+
+        km.charm.get_ca_bundles_from_fid_relations.return_value = []
+        km.write_combined_ca()
+        assert files[manager._KEYSTONE_COMBINED_CA] == "ca"
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+    def test_adds_to_empty_trust_store(self):
+        """Certificates added to an empty trust store are added incrementally."""
+        km, files = self._manager(None, [])
+        km.write_combined_ca()
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+        km.run_cmd.reset_mock()
+        km.charm.get_ca_and_chain.return_value = "ca"
+        km.write_combined_ca()
+        assert files[manager._KEYSTONE_COMBINED_CA] == "ca"
+        km.run_cmd.assert_called_once_with(["sudo", "update-ca-certificates"])
+
+    def test_removes_combined_ca(self):
+        """Removing the combined CA rebuilds the trust store afresh."""
+        km, files = self._manager("ca", [])
+        km.write_combined_ca()
+
+        km.run_cmd.reset_mock()
+        km.charm.get_ca_and_chain.return_value = None
+        km.write_combined_ca()
+        assert manager._KEYSTONE_COMBINED_CA not in files
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+        km.run_cmd.reset_mock()
+        km.write_combined_ca()
+        km.run_cmd.assert_not_called()
+
+    def test_refreshes_on_domain_ca_change(self):
+        """Trust store is rebuilt when domain CA files change."""
+        km, files = self._manager("ca", [])
+        container = km.charm.unit.get_container.return_value
+        container.list_files.return_value = []
+        km.write_combined_ca()
+
+        km.run_cmd.reset_mock()
+        container.list_files.return_value = [
+            SimpleNamespace(
+                name="keystone.ldap.crt",
+                size=10,
+                last_modified=datetime.datetime(2026, 1, 1),
+            )
+        ]
+        km.write_combined_ca()
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+        km.run_cmd.reset_mock()
+        km.write_combined_ca()
+        km.run_cmd.assert_not_called()
+
+        container.list_files.return_value = []
+        km.write_combined_ca()
+        km.run_cmd.assert_called_once_with(
+            ["sudo", "update-ca-certificates", "--fresh"]
+        )
+
+
+class TestKeyRepositorySync:
+    """Test key repositories are synced from the manifest of their keys."""
+
+    REPO = manager.FERNET_KEY_REPOSITORY
+
+    @staticmethod
+    def _manager(files):
+        def _name(path):
+            return path.rsplit("/", 1)[-1]
+
+        def _push(path, contents, **kwargs):
+            files[_name(path)] = contents
+
+        container = MagicMock()
+        container.list_files.side_effect = lambda path: [
+            SimpleNamespace(
+                name=name,
+                path=f"{path}/{name}",
+                type=testing.pebble.FileType.FILE,
+            )
+            for name in sorted(files)
+        ]
+        container.pull.side_effect = lambda path: io.StringIO(
+            files[_name(path)]
+        )
+        container.push.side_effect = _push
+        container.remove_path.side_effect = lambda path: files.pop(_name(path))
+        charm_mock = MagicMock()
+        charm_mock.unit.get_container.return_value = container
+        charm_mock._state.key_manifests = {}
+        return KEYSTONE_MANAGER(charm_mock, "keystone"), container
+
+    @staticmethod
+    def _next_hook(km):
+        """Manager of the next hook, sharing the unit stored state."""
+        return KEYSTONE_MANAGER(km.charm, km.container_name)
+
+    def test_sync_pushes_only_changed_keys(self):
+        """Only differing keys are pushed, stale keys are removed."""
+        files = {"0": "key0", "1": "key1"}
+        km, container = self._manager(files)
+
+        assert km.sync_keys(self.REPO, {"0": "key0new", "1": "key1"})
+        assert files == {"0": "key0new", "1": "key1"}
+        container.push.assert_called_once()
+        assert container.pull.call_count == 2
+
+        km = self._next_hook(km)
+        container.reset_mock()
+        assert not km.sync_keys(self.REPO, {"0": "key0new", "1": "key1"})
+        assert km.has_keys(self.REPO)
+        container.list_files.assert_called_once()
+        container.pull.assert_not_called()
+        container.push.assert_not_called()
+
+        assert km.sync_keys(self.REPO, {"1": "key1", "2": "key2"})
+        assert files == {"1": "key1", "2": "key2"}
+        container.pull.assert_not_called()
+        container.push.assert_called_once()
+        container.remove_path.assert_called_once_with(f"{self.REPO}/0")
+
+    def test_sync_rereads_changed_repository(self):
+        """Keys changed on disk behind the manifest are read again."""
+        files = {"0": "key0"}
+        km, container = self._manager(files)
+        assert not km.sync_keys(self.REPO, {"0": "key0"})
+
+        files["1"] = "key1"
+        km = self._next_hook(km)
+        assert km.sync_keys(self.REPO, {"0": "key0"})
+        assert files == {"0": "key0"}
+
+    def test_write_keys_stages_key_last(self):
+        """The staged key is only replaced once the other keys are written."""
+        files = {"0": "key0", "1": "key1"}
+        km, container = self._manager(files)
+        km.read_keys(self.REPO)
+        km.write_keys(self.REPO, {"0": "staged", "1": "key1", "2": "key0"})
+        assert [c.args[0] for c in container.push.call_args_list] == [
+            f"{self.REPO}/2",
+            f"{self.REPO}/0",
+        ]
+
+
+class TestFederationAssetSync:
+    """Test federation assets are synced from the manifest of their files."""
+
+    @staticmethod
+    def _manager(folders):
+        def _split(path):
+            return path.rsplit("/", 1)
+
+        def _list_files(path, itself=False):
+            if itself:
+                if path not in folders:
+                    raise testing.pebble.PathError("not-found", path)
+                return [
+                    SimpleNamespace(
+                        user="keystone", group="www-data", permissions=0o550
+                    )
+                ]
+            return [
+                SimpleNamespace(
+                    name=name,
+                    path=f"{path}/{name}",
+                    type=testing.pebble.FileType.FILE,
+                    size=len(contents.encode()),
+                )
+                for name, contents in sorted(folders.get(path, {}).items())
+            ]
+
+        def _push(path, contents, **kwargs):
+            folder, name = _split(path)
+            folders[folder][name] = contents
+
+        def _remove_path(path):
+            folder, name = _split(path)
+            folders[folder].pop(name)
+
+        container = MagicMock()
+        container.list_files.side_effect = _list_files
+        container.push.side_effect = _push
+        container.remove_path.side_effect = _remove_path
+        charm_mock = MagicMock()
+        charm_mock.unit.get_container.return_value = container
+        charm_mock._state.federation_manifests = {}
+        km = KEYSTONE_MANAGER(charm_mock, "keystone")
+        km.run_cmd = MagicMock()
+        return km, container
+
+    def test_metadata_pushed_only_on_change(self):
+        """Only differing metadata files are pushed, once per hook."""
+        folder = manager.SAML_PROVIDER_FOLDER
+        folders = {manager.SAML_METADATA_FOLDER: {}, folder: {"old": "old"}}
+        km, container = self._manager(folders)
+
+        assert km.write_saml_metadata({"a": "a"})
+        assert folders[folder] == {"a": "a"}
+        assert km.federation_changed
+        km.run_cmd.assert_not_called()
+        container.reset_mock()
+        assert not km.write_saml_metadata({"a": "a"})
+        container.list_files.assert_not_called()
+
+        km = KEYSTONE_MANAGER(km.charm, km.container_name)
+        km.run_cmd = MagicMock()
+        assert not km.write_saml_metadata({"a": "a"})
+        assert not km.federation_changed
+        container.push.assert_not_called()
+        assert km.write_saml_metadata({"a": "a", "b": "b"})
+        assert container.push.call_count == 1
+
+    def test_metadata_size_mismatch_pushed(self):
+        """A file whose size on disk differs is pushed again."""
+        folder = manager.SAML_PROVIDER_FOLDER
+        folders = {manager.SAML_METADATA_FOLDER: {}, folder: {}}
+        km, container = self._manager(folders)
+        assert km.write_saml_metadata({"a": "a", "b": "b"})
+
+        folders[folder]["a"] = ""
+        km = KEYSTONE_MANAGER(km.charm, km.container_name)
+        km.run_cmd = MagicMock()
+        container.reset_mock()
+        assert km.write_saml_metadata({"a": "a", "b": "b"})
+        container.push.assert_called_once()
+        assert folders[folder] == {"a": "a", "b": "b"}
+
+    def test_saml_key_and_cert(self):
+        """The SAML key and cert are written and removed as a set."""
+        folders = {}
+        km, container = self._manager(folders)
+        km.run_cmd.side_effect = lambda cmd: folders.update(
+            {path: {} for path in cmd[9:]}
+        )
+
+        assert km.ensure_saml_cert_and_key_state("cert", "key")
+        km.run_cmd.assert_called_once_with(
+            [
+                "sudo",
+                "install",
+                "-d",
+                "-o",
+                "keystone",
+                "-g",
+                "www-data",
+                "-m",
+                "550",
+                manager.SAML_METADATA_FOLDER,
+                manager.SAML_PROVIDER_FOLDER,
+            ]
+        )
+        assert folders[manager.SAML_METADATA_FOLDER] == {
+            "saml_sp_cert.pem": "cert",
+            "saml_sp_key.pem": "key",
+        }
+
+        km = KEYSTONE_MANAGER(km.charm, km.container_name)
+        assert not km.ensure_saml_cert_and_key_state("cert", "key")
+        assert km.remove_saml_key_and_cert()
+        assert folders[manager.SAML_METADATA_FOLDER] == {}
+
+
+class TestBootstrapCheckpoints:
+    """Test keystone bootstrap resumes from its checkpoints."""
+
+    @staticmethod
+    def _manager(app_data, keys):
+        container = MagicMock()
+        container.list_files.side_effect = lambda path: [
+            SimpleNamespace(
+                name="0",
+                path=f"{path}/0",
+                type=testing.pebble.FileType.FILE,
+            )
+            for _ in keys.get(path, [])
+        ]
+        charm_mock = MagicMock()
+        charm_mock.unit.get_container.return_value = container
+        charm_mock.dbs = {}
+        charm_mock.model.config = {"region": "RegionOne"}
+        for attr in (
+            "charm_user",
+            "charm_password",
+            "admin_user",
+            "admin_password",
+            "admin_role",
+            "service_project",
+            "admin_endpoint",
+            "internal_endpoint",
+            "public_endpoint",
+        ):
+            setattr(charm_mock, attr, attr)
+        charm_mock.credentials_revision.side_effect = (
+            lambda username: f"secret:{username}/1"
+        )
+        charm_mock.peers.get_app_data.side_effect = app_data.get
+        charm_mock.peers.set_app_data.side_effect = app_data.update
+        charm_mock._state.key_manifests = {}
+        km = KEYSTONE_MANAGER(charm_mock, "keystone")
+        km.run_cmd = MagicMock()
+        km._ksclient = MagicMock()
+        return km, container
+
+    def test_setup_keystone_resumes(self):
+        """Key repositories are set up concurrently, completed steps skipped."""
+        app_data = {}
+        km, container = self._manager(app_data, {})
+
+        km.run_cmd.side_effect = [
+            None,
+            None,
+            testing.pebble.ExecError(["keystone-manage"], 1, "", "fail"),
+        ]
+        with pytest.raises(manager.KeystoneExceptionError):
+            km.setup_keystone()
+        km.run_cmd.assert_any_call(
+            [
+                "sudo",
+                "chown",
+                "keystone:keystone",
+                manager.FERNET_KEY_REPOSITORY,
+                manager.CREDENTIAL_KEY_REPOSITORY,
+            ]
+        )
+        assert [c.args[0][4] for c in km.run_cmd.call_args_list[1:]] == [
+            "fernet_setup",
+            "credential_setup",
+        ]
+        assert manager.BOOTSTRAP_CHECKPOINTS_KEY not in app_data
+
+        keys = {
+            manager.FERNET_KEY_REPOSITORY: ["0"],
+            manager.CREDENTIAL_KEY_REPOSITORY: ["0"],
+        }
+        km, container = self._manager(app_data, keys)
+        km.setup_keystone()
+        km.run_cmd.assert_called_once()
+        assert km.run_cmd.call_args.args[0][2] == "bootstrap"
+        assert km._bootstrap_inputs()["password"] == "secret:charm_user/1"
+
+        km, container = self._manager(app_data, keys)
+        km.setup_keystone()
+        km.run_cmd.assert_not_called()
+        km.ksclient.get_user_object.assert_not_called()
+        km.ksclient.get_role_object.assert_not_called()
+
+        km, container = self._manager(app_data, keys)
+        km.charm.credentials_revision.side_effect = (
+            lambda username: f"secret:{username}/2"
+        )
+        km.setup_keystone()
+        assert km.run_cmd.call_args.args[0][2] == "bootstrap"
+
+    def test_initial_projects_and_users_checkpoint(self):
+        """Initial projects and users are set up again only when needed."""
+        app_data = {}
+        km, _ = self._manager(app_data, {})
+        km.setup_initial_projects_and_users()
+        assert km.ksclient.create_domain.called
+
+        km, _ = self._manager(app_data, {})
+        km.setup_initial_projects_and_users()
+        km.ksclient.create_domain.assert_not_called()
+
+        km, _ = self._manager(app_data, {})
+        km.charm._state.service_project_id = None
+        km.setup_initial_projects_and_users()
+        assert km.ksclient.create_domain.called
+
+
+class TestWSGIKeystoneReload:
+    """Test the keystone wsgi service is reloaded rather than restarted."""
+
+    def test_start_all_reloads_running_service(self):
+        """Running wsgi service is gracefully reloaded by start_all."""
+        container = MagicMock()
+        container.get_services.return_value = {
+            "wsgi-keystone": MagicMock(**{"is_running.return_value": True})
+        }
+        handler = charm.WSGIKeystonePebbleHandler.__new__(
+            charm.WSGIKeystonePebbleHandler
+        )
+        handler.charm = MagicMock()
+        handler.charm.unit.get_container.return_value = container
+        handler.container_name = "keystone"
+        handler.wsgi_service_name = "wsgi-keystone"
+        handler._files_changed = []
+
+        handler.start_all(restart=True)
+
+        container.send_signal.assert_called_once_with(
+            "SIGUSR1", "wsgi-keystone"
+        )
+        container.restart.assert_not_called()
+        container.stop.assert_not_called()
+
+
 class TestHandleCertificateTransfers:
     """Test _handle_certificate_transfers sends certs on send-ca-cert relations."""
 
@@ -2676,6 +3239,44 @@ class TestCheckOutstandingIdentityCredentialsRequests:
             mgr.charm.check_outstanding_identity_credentials_requests()
             km.create_service_account.assert_not_called()
 
+    def test_reprocessed_when_region_changes(self, ctx, complete_state):
+        """A processed credential request is processed again for a new region."""
+        state_mid = _bootstrap(ctx, complete_state)
+        km = charm.manager.KeystoneManager.return_value
+
+        cred_rel = testing.Relation(
+            endpoint="identity-credentials",
+            remote_app_name="nova",
+            remote_app_data={"username": "nova"},
+            local_app_data={
+                "credentials": "secret://some-id",
+                "admin-role": "admin",
+            },
+            remote_units_data={0: {}},
+        )
+        state_with_cred = dataclasses.replace(
+            state_mid,
+            relations=[*state_mid.relations, cred_rel],
+        )
+
+        ctx2 = _new_ctx()
+        km.create_service_account.reset_mock()
+        state_out = ctx2.run(ctx2.on.config_changed(), state_with_cred)
+        km.create_service_account.assert_not_called()
+        cleanup_database_requires_events()
+
+        ctx3 = _new_ctx()
+        ctx3.run(
+            ctx3.on.config_changed(),
+            dataclasses.replace(
+                _fix_checks(state_out),
+                config={**state_out.config, "region": "RegionTwo"},
+            ),
+        )
+        km.create_service_account.assert_called_once()
+        call_kwargs = km.create_service_account.call_args[1]
+        assert call_kwargs["username"] == "nova"
+
     def test_no_username_is_skipped(self, ctx, complete_state):
         """A credential relation without username → request not processed."""
         state_mid = _bootstrap(ctx, complete_state)
@@ -2818,7 +3419,7 @@ class TestOnSecretRemove:
     def test_identity_service_secret_deletes_old_users(
         self, ctx, complete_state
     ):
-        """secret-remove for identity service secret → deletes old rotated users."""
+        """secret-remove queues old rotated users, update-status deletes them."""
         state_mid = _bootstrap(ctx, complete_state)
         km = charm.manager.KeystoneManager.return_value
         km.ksclient.delete_user.reset_mock()
@@ -2860,9 +3461,64 @@ class TestOnSecretRemove:
         )
 
         ctx2 = _new_ctx()
-        ctx2.run(ctx2.on.secret_remove(idsvc_secret, revision=1), state_final)
+        state_out = ctx2.run(
+            ctx2.on.secret_remove(idsvc_secret, revision=1), state_final
+        )
+        cleanup_database_requires_events()
 
-        km.ksclient.delete_user.assert_called_with("svc_cinder-olduser")
+        km.ksclient.delete_user.assert_not_called()
+        peer = state_out.get_relations("peers")[0]
+        assert json.loads(peer.local_app_data["old_service_users"]) == []
+        assert json.loads(peer.local_app_data["retired_service_users"]) == [
+            "svc_cinder-olduser"
+        ]
+
+        ctx3 = _new_ctx()
+        state_out = ctx3.run(ctx3.on.update_status(), state_out)
+
+        km.ksclient.delete_user.assert_called_once_with("svc_cinder-olduser")
+        peer = state_out.get_relations("peers")[0]
+        assert json.loads(peer.local_app_data["retired_service_users"]) == []
+
+    def test_retire_service_users_is_bounded(self, ctx, complete_state):
+        """Retired users are deleted a bounded number at a time."""
+        state_mid = _bootstrap(ctx, complete_state)
+        km = charm.manager.KeystoneManager.return_value
+        km.ksclient.delete_user.reset_mock()
+        km.ksclient.delete_user.side_effect = [
+            None,
+            keystoneauth1.exceptions.NotFound(),
+            keystoneauth1.exceptions.ConnectFailure("Failed"),
+            client.KeystoneExceptionError("More than one user"),
+            None,
+        ]
+        users = [f"svc_cinder-{i}" for i in range(8)]
+        peer = state_mid.get_relations("peers")[0]
+        updated_peer = dataclasses.replace(
+            peer,
+            local_app_data={
+                **dict(peer.local_app_data),
+                "retired_service_users": json.dumps(users),
+            },
+        )
+        state_in = dataclasses.replace(
+            state_mid,
+            relations=[
+                updated_peer if r.endpoint == "peers" else r
+                for r in state_mid.relations
+            ],
+        )
+
+        ctx2 = _new_ctx()
+        state_out = ctx2.run(ctx2.on.update_status(), state_in)
+
+        assert km.ksclient.delete_user.call_count == 5
+        peer = state_out.get_relations("peers")[0]
+        # The user which failed to be deleted is retried after the others.
+        assert json.loads(peer.local_app_data["retired_service_users"]) == [
+            *users[5:],
+            users[2],
+        ]
 
 
 # ---------------------------------------------------------------------------
@@ -3227,6 +3883,52 @@ class TestCheckOutstandingIdentityEndpointsRequests:
             km.ksclient.list_endpoints.assert_not_called()
 
 
+class TestOutstandingRequestsContinuation:
+    """Test outstanding requests continue in a later hook."""
+
+    def test_budget_exhausted_defers(self, ctx, complete_state, monkeypatch):
+        """Defer the continuation event once the time budget is spent."""
+        state_mid = _bootstrap(ctx, complete_state)
+        km = charm.manager.KeystoneManager.return_value
+        ops_rel = testing.Relation(
+            endpoint="identity-ops",
+            remote_app_name="nova",
+            remote_app_data={
+                "request": json.dumps(
+                    {
+                        "id": "req-1",
+                        "ops": [
+                            {
+                                "name": "create_domain",
+                                "params": {"name": "nova-domain"},
+                            }
+                        ],
+                    }
+                ),
+            },
+            remote_units_data={0: {}},
+        )
+        state_with_ops = dataclasses.replace(
+            state_mid,
+            relations=[*state_mid.relations, ops_rel],
+        )
+        km.ksclient.create_domain.reset_mock()
+        km.ksclient.create_domain.return_value = "domain-id"
+
+        monkeypatch.setattr(charm, "OUTSTANDING_REQUESTS_BUDGET", -1)
+        ctx2 = _new_ctx()
+        state_out = ctx2.run(ctx2.on.config_changed(), state_with_ops)
+        cleanup_database_requires_events()
+        km.ksclient.create_domain.assert_not_called()
+        assert [e.name for e in state_out.deferred] == ["outstanding_requests"]
+
+        monkeypatch.setattr(charm, "OUTSTANDING_REQUESTS_BUDGET", 120)
+        ctx3 = _new_ctx()
+        state_out = ctx3.run(ctx3.on.config_changed(), state_out)
+        km.ksclient.create_domain.assert_called_once()
+        assert state_out.deferred == []
+
+
 # ===========================================================================
 # Strengthened behavioural tests
 # ===========================================================================
@@ -3554,6 +4256,157 @@ class TestDedupePreserveOrder:
         assert result == ["x"]
 
 
+class TestKeystoneClientCachedLookups:
+    """Unit tests for KeystoneClient.cached_lookups."""
+
+    @staticmethod
+    def _client():
+        domain = MagicMock(id="did", description="", enabled=True)
+        domain.name = "services"
+        api = MagicMock()
+        api.domains.list.return_value = [domain]
+        return client.KeystoneClient(api), api
+
+    def test_lookups_reused_within_context(self):
+        """List domains once for all lookups in the context."""
+        ksclient, api = self._client()
+        with ksclient.cached_lookups():
+            assert ksclient.get_domain_object("services").id == "did"
+            assert ksclient.show_domain("services")["id"] == "did"
+            ksclient.list_project(domain="services")
+        assert api.domains.list.call_count == 1
+
+    def test_lookups_refreshed_after_domain_change(self):
+        """Refresh the domain list after a domain is created."""
+        ksclient, api = self._client()
+        with ksclient.cached_lookups():
+            ksclient.create_domain(name="other")
+            ksclient.get_domain_object("other")
+        assert api.domains.list.call_count == 2
+
+    def test_project_and_role_lookups_reused(self):
+        """List projects and roles once per domain in the context."""
+        ksclient, api = self._client()
+        with ksclient.cached_lookups():
+            ksclient.get_project_object("p1", domain="services")
+            ksclient.list_project(domain="services")
+            ksclient.get_role_object("r1", domain="services")
+            ksclient.list_role(domain="services")
+        assert api.projects.list.call_count == 1
+        assert api.roles.list.call_count == 1
+
+    def test_project_and_role_lookups_refreshed_after_change(self):
+        """Refresh project and role lists after they are modified."""
+        ksclient, api = self._client()
+        with ksclient.cached_lookups():
+            ksclient.list_project(domain="services")
+            ksclient.create_project(name="p2", domain="services")
+            ksclient.list_project(domain="services")
+            ksclient.list_role(domain="services")
+            ksclient.create_role(name="r2", domain="services")
+            ksclient.list_role(domain="services")
+        assert api.projects.list.call_count == 2
+        assert api.roles.list.call_count == 2
+
+    def test_lookups_not_cached_outside_context(self):
+        """Always list domains outside of the context."""
+        ksclient, api = self._client()
+        with ksclient.cached_lookups():
+            ksclient.get_domain_object("services")
+        ksclient.get_domain_object("services")
+        ksclient.get_domain_object("services")
+        assert api.domains.list.call_count == 3
+
+
+class TestRequestQueue:
+    """Unit tests for RequestQueue."""
+
+    @staticmethod
+    def _relation(rid, data):
+        relation = MagicMock(id=rid)
+        relation.name = "identity-ops"
+        relation.data = {relation.app: data}
+        return relation
+
+    @staticmethod
+    def _queue(relations, budget=60, inputs=None):
+        peers = MagicMock()
+        app_data = {}
+        peers.get_app_data.side_effect = app_data.get
+        peers.set_app_data.side_effect = app_data.update
+        peers.model.relations = {"identity-ops": relations}
+        queue = request_queue.RequestQueue(
+            peers, budget, lambda relation_name: inputs or {}
+        )
+        return queue, app_data
+
+    def test_only_new_or_changed_requests_pending(self):
+        """Yield a request again only after it changed."""
+        rel1 = self._relation(1, {"request": "a"})
+        rel2 = self._relation(2, {"request": "b"})
+        queue, app_data = self._queue([rel1, rel2])
+        for relation in queue.pending("identity-ops"):
+            queue.done(relation)
+        queue.save()
+
+        rel2.data[rel2.app]["request"] = "c"
+        queue, _ = self._queue([rel1, rel2])
+        queue._digests = json.loads(
+            app_data[request_queue.PROCESSED_REQUESTS_KEY]
+        )
+        assert list(queue.pending("identity-ops")) == [rel2]
+        assert list(queue.pending("identity-ops", force=True)) == [
+            rel1,
+            rel2,
+        ]
+
+    def test_stale_relations_pruned(self):
+        """Forget requests from removed relations."""
+        rel1 = self._relation(1, {"request": "a"})
+        queue, app_data = self._queue([rel1])
+        for relation in queue.pending("identity-ops"):
+            queue.done(relation)
+        queue.peers.model.relations = {"identity-ops": []}
+        assert list(queue.pending("identity-ops")) == []
+        queue.save()
+        assert json.loads(app_data[request_queue.PROCESSED_REQUESTS_KEY]) == {
+            "identity-ops": {}
+        }
+
+    def test_digests_saved_once(self):
+        """Write the processed requests once, and only when changed."""
+        relations = [self._relation(i, {"request": str(i)}) for i in range(3)]
+        queue, _ = self._queue(relations)
+        for relation in queue.pending("identity-ops"):
+            queue.done(relation)
+        queue.save()
+        queue.save()
+        assert queue.peers.set_app_data.call_count == 1
+
+    def test_local_inputs_changed(self):
+        """Yield all requests again once the local inputs changed."""
+        relations = [self._relation(i, {"request": str(i)}) for i in range(2)]
+        queue, app_data = self._queue(relations, inputs={"region": "One"})
+        assert not queue.inputs_changed(relations[0])
+        for relation in queue.pending("identity-ops"):
+            queue.done(relation)
+        queue.save()
+
+        queue, _ = self._queue(relations, inputs={"region": "Two"})
+        queue._digests = json.loads(
+            app_data[request_queue.PROCESSED_REQUESTS_KEY]
+        )
+        assert queue.inputs_changed(relations[0])
+        assert list(queue.pending("identity-ops")) == relations
+
+    def test_budget_exhausted(self):
+        """Stop yielding requests once the time budget is spent."""
+        queue, _ = self._queue([self._relation(1, {"request": "a"})], -1)
+        assert list(queue.pending("identity-ops")) == []
+        assert queue.exhausted
+        assert list(queue.pending("identity-ops", force=True)) == []
+
+
 class TestReceiveCaCertPropagation:
     """Test receive-ca-cert propagation to send-ca-cert."""
 
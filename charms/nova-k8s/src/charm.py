@@ -477,6 +477,8 @@ class NovaOperatorCharm(sunbeam_charm.OSBaseOperatorAPICharm):
     """Charm the service."""
 
     _state = ops.framework.StoredState()
+    # Every compute unit joining nova-service requests the same config.
+    debounced_relations = frozenset({"nova-service"})
     service_name = "nova-api"
     wsgi_admin_script = "/usr/bin/nova-api-wsgi"
     wsgi_public_script = "/usr/bin/nova-api-wsgi"
@@ -18,7 +18,9 @@
 This charm provide Glance services as part of an OpenStack deployment
 """
 
+import json
 import logging
+import time
 from typing import (
     List,
     Mapping,
@@ -50,6 +52,18 @@ OVN_SB_DB_CONTAINER = "ovn-sb-db-server"
 OVN_NB_DB_CONTAINER = "ovn-nb-db-server"
 OVN_NORTHD_CONTAINER = "ovn-northd"
 OVN_DB_CONTAINERS = [OVN_SB_DB_CONTAINER, OVN_NB_DB_CONTAINER]
+OVN_DB_FILES = {
+    "nb": "/var/lib/ovn/ovnnb_db.db",
+    "sb": "/var/lib/ovn/ovnsb_db.db",
+}
+# Peer unit data key holding the compaction state of the unit's databases.
+OVN_DB_COMPACTION_KEY = "ovsdb-compaction"
+# Seconds after a unit compacted a database during which the other units
+# do not compact it.
+OVN_DB_COMPACTION_STAGGER = 10 * 60
+# Seconds after which the compaction state of a unit which did not check
+# its databases since, e.g. failing update-status, is ignored by the others.
+OVN_DB_COMPACTION_STALE = 30 * 60
 
 
 @sunbeam_tracing.trace_type
@@ -188,13 +202,119 @@ class OVNCentralOperatorCharm(sunbeam_charm.OSBaseOperatorCharmK8S):
     def __init__(self, framework: ops.framework.Framework) -> None:
         """Run constructor."""
         super().__init__(framework)
+        self._state.set_default(ovsdb_compaction={})
         self.framework.observe(self.on.upgrade_charm, self._on_upgrade_charm)
+        self.framework.observe(self.on.update_status, self._on_update_status)
 
     def _on_upgrade_charm(self, event: ops.framework.EventBase):
         """Handle the upgrade charm event."""
         logger.info("Handling upgrade-charm event")
         self.certs.validate_and_regenerate_certificates_if_needed()
 
+    def _on_update_status(self, event: ops.framework.EventBase):
+        """Compact the OVN databases which grew enough."""
+        if not self.bootstrapped():
+            return
+        compaction = {
+            db: dict(state)
+            for db, state in self._state.ovsdb_compaction.items()
+        }
+        for db in OVN_DB_FILES:
+            try:
+                compaction[db] = self.compact_ovn_db(
+                    db, compaction.get(db, {})
+                )
+            except (
+                ops.pebble.APIError,
+                ops.pebble.ConnectionError,
+                ops.pebble.ExecError,
+                tenacity.RetryError,
+            ) as e:
+                logger.warning(f"Unable to check compaction of {db}: {e}")
+        self._state.ovsdb_compaction = compaction
+        self.peers.set_unit_data(
+            {OVN_DB_COMPACTION_KEY: json.dumps(compaction, sort_keys=True)}
+        )
+
+    @staticmethod
+    def _db_file_size(container, db):
+        """Size of the file of db, in bytes."""
+        return container.list_files(OVN_DB_FILES[db], itself=True)[0].size
+
+    def compact_ovn_db(self, db, state):
+        """Compact db if its file grew enough since it was last compacted.
+
+        Followers compact first, the Raft leader only compacts once no
+        follower which checked the database recently needs to, and a unit
+        holds off while another unit compacted the database recently.
+
+        :param db: Database to operate on, 'nb' or 'sb'
+        :type db: str
+        :param state: Compaction state of db on this unit, its file size
+                      after the last compaction, when that was, when it was
+                      last checked and whether it is due
+        :type state: Dict[str, Any]
+        :returns: Updated compaction state of db
+        :rtype: Dict[str, Any]
+        """
+        if db == "nb":
+            container_name = OVN_NB_DB_CONTAINER
+        elif db == "sb":
+            container_name = OVN_SB_DB_CONTAINER
+        target = "ovn{}_db".format(db)
+        container = self.unit.get_container(container_name)
+        executor = self.get_pebble_executor(container_name)
+        try:
+            size = self._db_file_size(container, db)
+        except ops.pebble.PathError:
+            return state
+        logging.debug(f"{db} database file size {size}")
+
+        now = time.time()
+        state = dict(state)
+        state["checked-at"] = now
+        # ovsdb-server also compacts the database by itself.
+        state["size"] = min(state.get("size", size), size)
+        growth = int(self.config["ovsdb-server-compaction-growth"])
+        min_size = int(self.config["ovsdb-server-compaction-min-size"]) << 20
+        state["due"] = (
+            growth > 0
+            and size >= min_size
+            and size * 100 >= state["size"] * (100 + growth)
+        )
+        if not state["due"]:
+            return state
+
+        peers = [
+            json.loads(value).get(db, {})
+            for value in self.peers.get_all_unit_values(OVN_DB_COMPACTION_KEY)
+        ]
+        if any(
+            now - peer.get("compacted-at", 0) < OVN_DB_COMPACTION_STAGGER
+            for peer in peers
+        ):
+            logging.debug(f"{db} database compacted by a peer recently")
+            return state
+        status = self.cluster_status(target, cmd_executor=executor)
+        if (
+            status
+            and status.is_cluster_leader
+            and any(
+                peer.get("due")
+                and now - peer.get("checked-at", 0) < OVN_DB_COMPACTION_STALE
+                for peer in peers
+            )
+        ):
+            logging.debug(f"Waiting for followers to compact {db} database")
+            return state
+
+        logging.info(f"Compacting {db} database, file size {size}")
+        ovn.compact(target, rundir=self.ovn_rundir(), cmd_executor=executor)
+        state["size"] = self._db_file_size(container, db)
+        state["compacted-at"] = now
+        state["due"] = False
+        return state
+
     def get_pebble_handlers(self):
         """Pebble handlers for all OVN containers."""
         pebble_handlers = [
@@ -311,6 +431,67 @@ class OVNCentralOperatorCharm(sunbeam_charm.OSBaseOperatorCharmK8S):
             )
             return
 
+    @tenacity.retry(
+        stop=tenacity.stop_after_attempt(3),
+        retry=tenacity.retry_if_exception_type(ops.pebble.ExecError),
+        after=tenacity.after_log(logger, logging.WARNING),
+        wait=tenacity.wait_exponential(multiplier=1, min=5, max=30),
+    )
+    def change_election_timer(self, db, election_timer, cmd_executor):
+        """Change the election timer of clustered OVSDB.
+
+        A change is refused while the previous one is not committed to the
+        cluster yet, so the change is retried.
+
+        :param db: Database to operate on
+        :type db: str
+        :param election_timer: New value of election timer, in milliseconds
+        :type election_timer: int
+        """
+        ovn.change_election_timer(
+            db,
+            election_timer,
+            rundir=self.ovn_rundir(),
+            cmd_executor=cmd_executor,
+        )
+
+    def configure_ovn_election_timer(self, db):
+        """Change the Raft election timer of db to the configured value.
+
+        Only the cluster leader can change the election timer, and only up
+        to twice or half its current value at once, so it is changed in
+        steps.
+
+        :param db: Database to operate on, 'nb' or 'sb'
+        :type db: str
+        """
+        if db == "nb":
+            executor = self.get_pebble_executor(OVN_NB_DB_CONTAINER)
+        elif db == "sb":
+            executor = self.get_pebble_executor(OVN_SB_DB_CONTAINER)
+        status = self.cluster_status(
+            "ovn{}_db".format(db), cmd_executor=executor
+        )
+        if not status or not status.is_cluster_leader:
+            return
+        desired = int(self.config["ovsdb-server-election-timer"]) * 1000
+        for election_timer in ovn.election_timer_steps(
+            status.election_timer, desired
+        ):
+            logging.info(
+                "Changing {} election timer to {}ms".format(db, election_timer)
+            )
+            self.status.set(
+                ops.MaintenanceStatus(
+                    "Changing {} election timer to {}ms".format(
+                        db.upper(), election_timer
+                    )
+                )
+            )
+            self.change_election_timer(
+                "ovn{}_db".format(db), election_timer, executor
+            )
+
     def configure_ovn_listener(self, db, port_map):
         """Create or update OVN listener configuration.
 
@@ -472,7 +653,14 @@ class OVNCentralOperatorCharm(sunbeam_charm.OSBaseOperatorCharmK8S):
         self.unit.open_port("tcp", 6642)
 
     def configure_ovn(self):
-        """Configure ovn listener."""
+        """Configure ovn listener and cluster."""
+        election_timer = int(self.config["ovsdb-server-election-timer"])
+        if not 1 <= election_timer <= 60:
+            raise sunbeam_guard.BlockedExceptionError(
+                "ovsdb-server-election-timer must be between 1 and 60"
+            )
+        self.configure_ovn_election_timer("nb")
+        self.configure_ovn_election_timer("sb")
         inactivity_probe = (
             int(self.config["ovsdb-server-inactivity-probe"]) * 1000
         )
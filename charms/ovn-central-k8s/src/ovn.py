@@ -252,6 +252,104 @@ def cluster_status(
     )
 
 
+def election_timer_steps(current, desired):
+    """Election timer values to step through to change it to desired.
+
+    ovsdb-server refuses to more than double or halve the election timer in
+    a single change.
+
+    :param current: Current value of election timer
+    :type current: int
+    :param desired: Desired value of election timer
+    :type desired: int
+    :returns: Values to change the election timer to, in order
+    :rtype: List[int]
+    """
+    steps = []
+    while current != desired:
+        if desired > current:
+            current = min(current * 2, desired)
+        else:
+            current = max(current // 2, desired)
+        steps.append(current)
+    return steps
+
+
+def change_election_timer(
+    target,
+    election_timer,
+    schema=None,
+    use_ovs_appctl=False,
+    rundir=None,
+    cmd_executor=None,
+):
+    """Change the election timer of clustered OVSDB.
+
+    Only the cluster leader can change the election timer.
+
+    :param target: One of 'ovnnb_db', 'ovnsb_db', can also be full path to
+                   control socket.
+    :type target: str
+    :param election_timer: New value of election timer, in milliseconds
+    :type election_timer: int
+    :param schema: Database schema name, deduced from target if not provided
+    :type schema: Optional[str]
+    :param use_ovs_appctl: The ``ovn-appctl`` command appeared in OVN 20.03,
+                           set this to True to use ``ovs-appctl`` instead.
+    :type use_ovs_appctl: bool
+    :param rundir: Override path to sockets
+    :type rundir: Optional[str]
+    :returns: Output from command
+    :rtype: str
+    """
+    schema_map = {
+        "ovnnb_db": "OVN_Northbound",
+        "ovnsb_db": "OVN_Southbound",
+    }
+    return ovn_appctl(
+        target,
+        (
+            "cluster/change-election-timer",
+            schema or schema_map[target],
+            str(election_timer),
+        ),
+        rundir=rundir,
+        use_ovs_appctl=use_ovs_appctl,
+        cmd_executor=cmd_executor,
+    )
+
+
+def compact(
+    target, schema=None, use_ovs_appctl=False, rundir=None, cmd_executor=None
+):
+    """Compact the database of OVSDB.
+
+    :param target: One of 'ovnnb_db', 'ovnsb_db', can also be full path to
+                   control socket.
+    :type target: str
+    :param schema: Database schema name, deduced from target if not provided
+    :type schema: Optional[str]
+    :param use_ovs_appctl: The ``ovn-appctl`` command appeared in OVN 20.03,
+                           set this to True to use ``ovs-appctl`` instead.
+    :type use_ovs_appctl: bool
+    :param rundir: Override path to sockets
+    :type rundir: Optional[str]
+    :returns: Output from command
+    :rtype: str
+    """
+    schema_map = {
+        "ovnnb_db": "OVN_Northbound",
+        "ovnsb_db": "OVN_Southbound",
+    }
+    return ovn_appctl(
+        target,
+        ("ovsdb-server/compact", schema or schema_map[target]),
+        rundir=rundir,
+        use_ovs_appctl=use_ovs_appctl,
+        cmd_executor=cmd_executor,
+    )
+
+
 def is_northd_active(cmd_executor=None):
     """Query `ovn-northd` for active status.
 
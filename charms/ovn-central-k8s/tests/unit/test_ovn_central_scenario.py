@@ -15,6 +15,8 @@
 """Scenario (state-transition) tests for ovn-central-k8s."""
 
 import contextlib
+import json
+import time
 from pathlib import (
     Path,
 )
@@ -84,6 +86,7 @@ def _mock_cluster_status() -> MagicMock:
     status = MagicMock()
     status.cluster_id = "test-cluster-id"
     status.is_cluster_leader = True
+    status.election_timer = 4000
     return status
 
 
@@ -287,3 +290,178 @@ class TestNonLeaderClusterJoin:
             state_out = ctx.run(ctx.on.config_changed(), state_in)
 
         assert state_out.unit_status == testing.ActiveStatus("")
+
+
+class TestElectionTimer:
+    """Raft election timer is changed stepwise on the cluster leader."""
+
+    def test_election_timer_steps(self):
+        """Test the timer is at most doubled or halved per step."""
+        assert charm.ovn.election_timer_steps(1000, 5000) == [
+            2000,
+            4000,
+            5000,
+        ]
+        assert charm.ovn.election_timer_steps(16000, 3000) == [
+            8000,
+            4000,
+            3000,
+        ]
+        assert charm.ovn.election_timer_steps(4000, 4000) == []
+
+    def test_election_timer_changed_on_leader(self, ctx):
+        """Test the configured timer is applied stepwise."""
+        state_in = testing.State(
+            leader=True,
+            config={"ovsdb-server-election-timer": 16},
+            containers=_containers(can_connect=True),
+            relations=_all_relations(),
+        )
+        with (
+            _tls_mocks(),
+            _heavy_ops_mocks(),
+            mock.patch.object(charm.ovn, "ovn_appctl") as ovn_appctl,
+        ):
+            state_out = ctx.run(ctx.on.config_changed(), state_in)
+
+        assert state_out.unit_status == testing.ActiveStatus("")
+        changes = [
+            (c.args[0], c.args[1][1:]) for c in ovn_appctl.call_args_list
+        ]
+        assert changes == [
+            ("ovnnb_db", ("OVN_Northbound", "8000")),
+            ("ovnnb_db", ("OVN_Northbound", "16000")),
+            ("ovnsb_db", ("OVN_Southbound", "8000")),
+            ("ovnsb_db", ("OVN_Southbound", "16000")),
+        ]
+
+    def test_election_timer_out_of_range_blocked(self, ctx):
+        """Test an election timer out of range blocks the charm."""
+        state_in = testing.State(
+            leader=True,
+            config={"ovsdb-server-election-timer": 61},
+            containers=_containers(can_connect=True),
+            relations=_all_relations(),
+        )
+        with _tls_mocks(), _heavy_ops_mocks():
+            state_out = ctx.run(ctx.on.config_changed(), state_in)
+
+        assert isinstance(state_out.unit_status, testing.BlockedStatus)
+
+
+class TestCompaction:
+    """OVN databases are compacted on update-status once they grew."""
+
+    @staticmethod
+    def _state(tmp_path, peers_data=None):
+        (tmp_path / "ovnnb_db.db").write_bytes(b"x" * 100)
+        (tmp_path / "ovnsb_db.db").write_bytes(b"x" * 300)
+        mounts = {
+            "databases": testing.Mount(
+                location="/var/lib/ovn", source=tmp_path
+            )
+        }
+        containers = [
+            testing.Container(name=name, can_connect=True, mounts=mounts)
+            for name in CONTAINER_NAMES
+        ]
+        return testing.State(
+            leader=True,
+            config={"ovsdb-server-compaction-min-size": 0},
+            containers=containers,
+            relations=[
+                _certificates_relation(),
+                testing.PeerRelation(
+                    endpoint="peers", peers_data=peers_data or {}
+                ),
+            ],
+            stored_states=[
+                testing.StoredState(
+                    owner_path="OVNCentralOperatorCharm",
+                    name="_state",
+                    content={
+                        "ovsdb_compaction": {"sb": {"size": 100}},
+                    },
+                )
+            ],
+        )
+
+    @staticmethod
+    def _compactions(ovn_appctl):
+        return [
+            c.args[0]
+            for c in ovn_appctl.call_args_list
+            if c.args[1][0] == "ovsdb-server/compact"
+        ]
+
+    def _run(self, ctx, state_in):
+        with (
+            _heavy_ops_mocks(),
+            mock.patch.object(
+                charm.OVNCentralOperatorCharm,
+                "bootstrapped",
+                return_value=True,
+            ),
+            mock.patch.object(
+                charm.ovn, "ovn_appctl", return_value=""
+            ) as ovn_appctl,
+        ):
+            state_out = ctx.run(ctx.on.update_status(), state_in)
+        return state_out, self._compactions(ovn_appctl)
+
+    def test_compacts_grown_database(self, ctx, tmp_path):
+        """Test only the database which grew enough is compacted."""
+        state_out, compactions = self._run(ctx, self._state(tmp_path))
+
+        assert compactions == ["ovnsb_db"]
+        peers = state_out.get_relations("peers")[0]
+        compaction = json.loads(peers.local_unit_data["ovsdb-compaction"])
+        assert compaction["nb"]["size"] == 100
+        assert compaction["nb"]["due"] is False
+        assert compaction["sb"]["due"] is False
+
+    def test_leader_waits_for_followers(self, ctx, tmp_path):
+        """Test the Raft leader does not compact before due followers."""
+        peers_data = {
+            1: {
+                "ovsdb-compaction": json.dumps(
+                    {"sb": {"due": True, "checked-at": time.time()}}
+                )
+            }
+        }
+        state_out, compactions = self._run(
+            ctx, self._state(tmp_path, peers_data)
+        )
+
+        assert compactions == []
+        peers = state_out.get_relations("peers")[0]
+        compaction = json.loads(peers.local_unit_data["ovsdb-compaction"])
+        assert compaction["sb"]["size"] == 100
+        assert compaction["sb"]["due"] is True
+
+    def test_leader_ignores_stale_followers(self, ctx, tmp_path):
+        """Test followers which stopped checking do not hold the leader."""
+        checked_at = time.time() - charm.OVN_DB_COMPACTION_STALE - 1
+        peers_data = {
+            1: {
+                "ovsdb-compaction": json.dumps(
+                    {"sb": {"due": True, "checked-at": checked_at}}
+                )
+            }
+        }
+        _, compactions = self._run(ctx, self._state(tmp_path, peers_data))
+
+        assert compactions == ["ovnsb_db"]
+
+    def test_compactions_are_staggered(self, ctx, tmp_path):
+        """Test a database compacted by a peer recently is not compacted."""
+        peers_data = {
+            1: {
+                "ovsdb-compaction": json.dumps(
+                    {"sb": {"compacted-at": time.time(), "due": False}}
+                )
+            }
+        }
+        _, compactions = self._run(ctx, self._state(tmp_path, peers_data))
+
+        assert compactions == []
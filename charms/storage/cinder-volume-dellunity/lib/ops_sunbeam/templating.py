@@ -0,0 +1,218 @@
+# Copyright 2021 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Module for rendering templates inside containers."""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+from pathlib import (
+    Path,
+)
+from typing import (
+    TYPE_CHECKING,
+)
+
+import ops.pebble
+
+if TYPE_CHECKING:
+    import ops_sunbeam.core as sunbeam_core
+    import ops.framework
+    import ops.model
+
+import jinja2
+import jinja2.meta
+
+log = logging.getLogger(__name__)
+
+
+# def get_container(
+#     containers: list[ops.model.Container], name: str
+# ) -> ops.model.Container | None:
+#     """Search for container with given name inlist of containers."""
+#     container = None
+#     for c in containers:
+#         if c.name == name:
+#             container = c
+#     return container
+
+
+def _get_template(
+    env: jinja2.Environment, config: "sunbeam_core.ContainerConfigFile"
+) -> jinja2.Template:
+    """Return the template used to render config."""
+    try:
+        return env.get_template(os.path.basename(config.path) + ".j2")
+    except jinja2.exceptions.TemplateNotFound:
+        return env.get_template(os.path.basename(config.path))
+
+
+@functools.lru_cache(maxsize=None)
+def _parse_template(
+    source: str,
+) -> tuple[frozenset[str], tuple[str, ...] | None]:
+    """Return the undeclared variables and templates referenced by source.
+
+    The referenced templates are None if any of them cannot be determined
+    statically.
+    """
+    ast = jinja2.Environment().parse(source)
+    variables = frozenset(jinja2.meta.find_undeclared_variables(ast))
+    references = tuple(jinja2.meta.find_referenced_templates(ast))
+    if None in references:
+        return variables, None
+    return variables, references  # type: ignore[return-value]
+
+
+def template_inputs(
+    template_dir: str, config: "sunbeam_core.ContainerConfigFile"
+) -> tuple[str, frozenset[str] | None]:
+    """Return the inputs of the template used to render config.
+
+    The inputs are a digest of the template sources, including included
+    and extended templates, and the context namespaces they reference.
+    Namespaces are None when they cannot be worked out statically.
+    """
+    env = jinja2.Environment(loader=jinja2.FileSystemLoader(template_dir))
+    basename = os.path.basename(config.path)
+    pending = [basename + ".j2", basename]
+    sources: dict[str, str] = {}
+    namespaces: set[str] | None = set()
+    while pending:
+        name = pending.pop(0)
+        if name in sources:
+            continue
+        try:
+            source, _, _ = env.loader.get_source(env, name)  # type: ignore[union-attr]
+        except jinja2.exceptions.TemplateNotFound:
+            continue
+        if not sources:
+            # The first template found is the one rendered, so drop the
+            # fallback name.
+            pending = []
+        sources[name] = source
+        variables, references = _parse_template(source)
+        if namespaces is not None:
+            namespaces.update(variables)
+        if references is None:
+            namespaces = None
+        else:
+            pending.extend(references)
+    digest = hashlib.sha256(
+        json.dumps(sources, sort_keys=True).encode()
+    ).hexdigest()
+    return digest, None if namespaces is None else frozenset(namespaces)
+
+
+def render_digest(
+    template_dir: str,
+    config: "sunbeam_core.ContainerConfigFile",
+    context: "sunbeam_core.OPSCharmContexts",
+) -> str:
+    """Digest of everything that determines the rendering of config."""
+    template_digest, namespaces = template_inputs(template_dir, config)
+    payload = [
+        list(config),
+        template_digest,
+        context.digest(namespaces),
+    ]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+class RenderedFileStorage:
+    """Record the render digests of files written on the local unit."""
+
+    def __init__(
+        self, storage: "ops.framework.BoundStoredState", container_name: str
+    ):
+        """Setup rendered file storage for container_name."""
+        self.storage = storage
+        self.container_name = container_name
+        try:
+            self.storage.rendered_files
+        except AttributeError:
+            self.storage.rendered_files = {}
+
+    def get(self, path: str) -> str | None:
+        """Digest of the last successful render of path."""
+        return self.storage.rendered_files.get(self.container_name, {}).get(
+            path
+        )
+
+    def set(self, path: str, digest: str) -> None:
+        """Record the digest of a successful render of path."""
+        if self.container_name not in self.storage.rendered_files:
+            self.storage.rendered_files[self.container_name] = {}
+        self.storage.rendered_files[self.container_name][path] = digest
+
+    def reset(self) -> None:
+        """Forget all renders in the container."""
+        self.storage.rendered_files.pop(self.container_name, None)
+
+
+def sidecar_config_render(
+    container: "ops.model.Container",
+    config: "sunbeam_core.ContainerConfigFile",
+    template_dir: str,
+    context: "sunbeam_core.OPSCharmContexts",
+) -> bool:
+    """Render templates inside containers.
+
+    :return: Whether file was updated.
+    :rtype: bool
+    """
+    loader = jinja2.FileSystemLoader(template_dir)
+    _tmpl_env = jinja2.Environment(loader=loader)
+    template = _get_template(_tmpl_env, config)
+    contents = template.render(context)
+
+    return sidecar_config_write(container, config, contents)
+
+
+def sidecar_config_write(
+    container: "ops.model.Container",
+    config: "sunbeam_core.ContainerConfigFile",
+    contents: str,
+) -> bool:
+    """Write file inside container.
+
+    :return: Whether file was updated.
+    :rtype: bool
+    """
+    try:
+        original_contents = container.pull(config.path).read()
+    except (ops.pebble.PathError, FileNotFoundError):
+        original_contents = None
+
+    if original_contents == contents:
+        log.debug(
+            f"{config.path} in {container.name} matches desired content."
+        )
+        return False
+
+    kwargs = {
+        "user": config.user,
+        "group": config.group,
+        "permissions": config.permissions,
+    }
+
+    parent_dir = str(Path(config.path).parent)
+    if not container.isdir(parent_dir):
+        container.make_dir(parent_dir, make_parents=True)
+
+    container.push(config.path, contents, **kwargs)
+    log.debug(f"Wrote template {config.path} in container {container.name}.")
+    return True
@@ -0,0 +1,179 @@
+# Copyright 2021 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Collection of core components."""
+
+import collections
+import functools
+import hashlib
+import json
+from typing import (
+    TYPE_CHECKING,
+    Generator,
+    Iterable,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    Union,
+)
+
+import ops_sunbeam.tracing as sunbeam_tracing
+
+if TYPE_CHECKING:
+    from ops_sunbeam.charm import (
+        OSBaseOperatorCharm,
+    )
+    from ops_sunbeam.config_contexts import (
+        ConfigContext,
+    )
+    from ops_sunbeam.relation_handlers import (
+        RelationHandler,
+    )
+
+ContainerConfigFile = collections.namedtuple(
+    "ContainerConfigFile",
+    ["path", "user", "group", "permissions"],
+    defaults=(None,),
+)
+
+RelationDataMapping = MutableMapping[str, str]
+ConfigMapping = Mapping[str, bool | int | float | str | None]
+ContextMapping = RelationDataMapping | ConfigMapping
+
+
+class RelationContext:
+    """Mixin for the immutable context objects built from relation handlers.
+
+    Concrete types are namedtuples created by `relation_context_type`, so
+    equality is plain tuple equality. Relation contexts may carry lists or
+    dicts, in which case hashing falls back to the canonical digest.
+    """
+
+    __slots__ = ()
+
+    _fields: tuple[str, ...]
+
+    def digest(self) -> str:
+        """Stable digest of the context type and values."""
+        payload = json.dumps(
+            [type(self).__name__, self._fields, list(self)],  # type: ignore[call-overload]
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def __hash__(self) -> int:
+        """Hash of the context, tolerating unhashable values."""
+        try:
+            return tuple.__hash__(self)  # type: ignore[arg-type]
+        except TypeError:
+            return hash(self.digest())
+
+
+@functools.lru_cache(maxsize=None)
+def relation_context_type(relation_name: str, fields: tuple[str, ...]) -> type:
+    """Return the context type for a relation and its set of keys.
+
+    Building a namedtuple class is expensive, so types are created once per
+    (relation name, keys) and reused by every subsequent context build.
+    """
+    obj_name = "".join([w.capitalize() for w in relation_name.split("-")])
+    base = collections.namedtuple(obj_name, fields)  # type: ignore[misc]
+    return type(obj_name, (RelationContext, base), {"__slots__": ()})
+
+
+@sunbeam_tracing.trace_type
+class OPSCharmContexts:
+    """Set of config contexts and contexts from relation handlers."""
+
+    def __init__(self, charm: "OSBaseOperatorCharm") -> None:
+        """Run constructor."""
+        self.charm = charm
+        self.namespaces: list[str] = []
+
+    def add_relation_handler(self, handler: "RelationHandler") -> None:
+        """Add relation handler."""
+        interface, relation_name = handler.get_interface()
+        _ns = relation_name.replace("-", "_")
+        self.namespaces.append(_ns)
+        ctxt = handler.context()
+        context_type = relation_context_type(relation_name, tuple(ctxt))
+        obj = context_type(*ctxt.values())
+        setattr(self, _ns, obj)
+        # Add special sobriquet for peers.
+        if _ns == "peers":
+            self.namespaces.append("leader_db")
+            setattr(self, "leader_db", obj)
+
+    def add_config_contexts(
+        self, config_adapters: Sequence["ConfigContext"]
+    ) -> None:
+        """Add multiple config contexts."""
+        for config_adapter in config_adapters:
+            self.add_config_context(config_adapter, config_adapter.namespace)
+
+    def add_config_context(
+        self, config_adapter: "ConfigContext", namespace: str
+    ) -> None:
+        """Add add config adapter to context."""
+        self.namespaces.append(namespace)
+        setattr(self, namespace, config_adapter)
+
+    def digest(self, namespaces: Iterable[str] | None = None) -> str:
+        """Digest of the given namespaces, defaulting to all of them.
+
+        Namespaces which are not present, for instance because the relation
+        is not ready yet, are recorded as missing so that their later
+        arrival changes the digest.
+        """
+        if namespaces is None:
+            namespaces = self.namespaces
+        payload = {
+            namespace: self._namespace_digest(namespace)
+            for namespace in sorted(set(namespaces))
+        }
+        return hashlib.sha256(
+            json.dumps(payload, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _namespace_digest(self, namespace: str) -> str | None:
+        """Digest of a single namespace."""
+        if namespace not in self.namespaces:
+            return None
+        obj = getattr(self, namespace)
+        if isinstance(obj, RelationContext):
+            return obj.digest()
+        # Config contexts expose their context as instance attributes.
+        values = {k: v for k, v in vars(obj).items() if k != "charm"}
+        payload = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def __iter__(
+        self,
+    ) -> Generator[
+        tuple[str, Union["ConfigContext", "RelationHandler"]], None, None
+    ]:
+        """Iterate over the relations presented to the charm."""
+        for namespace in self.namespaces:
+            yield namespace, getattr(self, namespace)
+
+
+class PostInitMeta(type):
+    """Allows object to run post init methods."""
+
+    def __call__(cls, *args, **kw):
+        """Call __post_init__ after __init__."""
+        instance = super().__call__(*args, **kw)
+        instance.__post_init__()
+        return instance
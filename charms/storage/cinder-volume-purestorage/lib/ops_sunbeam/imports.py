@@ -0,0 +1,85 @@
+# Copyright 2026 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Helpers to measure the cost of importing interface libraries.
+
+Relation handlers import their interface library when setting up their
+event handlers. Cold imports of the larger libraries are a significant
+part of short hooks, these helpers record what was imported, and how
+long it took, per hook kind.
+"""
+
+import collections
+import logging
+import os
+import sys
+import time
+import typing
+from contextlib import (
+    contextmanager,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing, per hook kind and label.
+_import_costs: dict[str, dict[str, float]] = collections.defaultdict(
+    lambda: collections.defaultdict(float)
+)
+
+
+def hook_kind() -> str:
+    """Kind of the hook being dispatched, e.g. 'update-status'."""
+    dispatch_path = os.environ.get("JUJU_DISPATCH_PATH")
+    if dispatch_path:
+        return dispatch_path.rsplit("/", 1)[-1]
+    return "unknown"
+
+
+@contextmanager
+def profile(label: str) -> typing.Iterator[None]:
+    """Record time spent in block under label if it imported modules."""
+    modules = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        imported = len(sys.modules) - modules
+        if imported > 0:
+            _import_costs[hook_kind()][label] += elapsed
+            logger.debug(
+                f"{label} imported {imported} modules in {elapsed:.3f}s"
+            )
+
+
+def import_costs(kind: str | None = None) -> dict[str, float]:
+    """Import costs recorded for the hook kind, the current one by default."""
+    return dict(_import_costs.get(kind or hook_kind(), {}))
+
+
+def log_import_costs() -> None:
+    """Log a summary of the import costs of the current hook."""
+    costs = import_costs()
+    if not costs:
+        return
+    summary = ", ".join(
+        f"{label}={elapsed:.3f}s"
+        for label, elapsed in sorted(
+            costs.items(), key=lambda item: item[1], reverse=True
+        )
+    )
+    logger.debug(
+        f"Import costs for {hook_kind()}: {sum(costs.values()):.3f}s "
+        f"({summary})"
+    )
@@ -0,0 +1,882 @@
+# Copyright 2021 Canonical Ltd.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Base classes for defining Pebble handlers.
+
+The PebbleHandler defines the pebble layers, manages pushing
+configuration to the containers and managing the service running
+in the container.
+"""
+
+import collections
+import io
+import json
+import logging
+import typing
+from collections.abc import (
+    Callable,
+)
+
+import ops.charm
+import ops.pebble
+import ops_sunbeam.compound_status as compound_status
+import ops_sunbeam.config_contexts as sunbeam_config_contexts
+import ops_sunbeam.core as sunbeam_core
+import ops_sunbeam.templating as sunbeam_templating
+import ops_sunbeam.tracing as sunbeam_tracing
+from ops.model import (
+    ActiveStatus,
+    BlockedStatus,
+    WaitingStatus,
+)
+
+if typing.TYPE_CHECKING:
+    from ops_sunbeam.charm import (
+        OSBaseOperatorAPICharm,
+        OSBaseOperatorCharm,
+        OSBaseOperatorCharmK8S,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Number of stderr lines kept to report failed commands.
+EXEC_ERROR_TAIL_LINES = 50
+
+ContainerDir = collections.namedtuple(
+    "ContainerDir",
+    ["path", "user", "group", "permissions"],
+    defaults=(None,),
+)
+
+
+def make_dirs(
+    container: ops.model.Container, dirs: typing.Sequence[ContainerDir]
+) -> None:
+    """Create directories in container, parents included.
+
+    Pebble accepts several directories in a single make-dirs request but
+    ops only exposes single directory creation, so the request is sent
+    directly when possible, falling back to one call per directory.
+    """
+    request = getattr(container.pebble, "_request", None)
+    if len(dirs) < 2 or request is None:
+        for d in dirs:
+            container.make_dir(
+                d.path,
+                user=d.user,
+                group=d.group,
+                permissions=d.permissions,
+                make_parents=True,
+            )
+        return
+
+    infos = []
+    for d in dirs:
+        info: dict[str, typing.Any] = {"path": d.path, "make-parents": True}
+        if d.permissions is not None:
+            info["permissions"] = f"{d.permissions:03o}"
+        if d.user is not None:
+            info["user"] = d.user
+        if d.group is not None:
+            info["group"] = d.group
+        infos.append(info)
+    resp = request(
+        "POST", "/v1/files", None, {"action": "make-dirs", "dirs": infos}
+    )
+    for item in resp.get("result") or []:
+        error = item.get("error")
+        if error:
+            raise ops.pebble.PathError(error["kind"], error["message"])
+
+
+class _LogWriter(io.TextIOBase):
+    """Write-through stream that logs each line as it arrives.
+
+    Only the last max_lines lines are retained when max_lines is set.
+    """
+
+    def __init__(
+        self, log_fn: typing.Callable[..., None], max_lines: int | None = None
+    ) -> None:
+        self._log = log_fn
+        self._buf = ""
+        self._lines: collections.deque[str] = collections.deque(
+            maxlen=max_lines
+        )
+
+    def write(self, data: str) -> int:  # type: ignore[override]
+        *lines, self._buf = (self._buf + data).split("\n")
+        for line in lines:
+            self._log("    %s", line)
+            self._lines.append(line + "\n")
+        return len(data)
+
+    def flush(self) -> None:
+        if self._buf:
+            self._log("    %s", self._buf)
+            self._lines.append(self._buf)
+            self._buf = ""
+
+    def log_tail(self, log_fn: typing.Callable[..., None]) -> None:
+        """Log the retained lines."""
+        for line in self._lines:
+            log_fn("    %s", line.rstrip("\n"))
+
+    def getvalue(self) -> str:
+        return "".join(self._lines)
+
+
+class ProvisionedDirStorage:
+    """Record the directories created in a container on the local unit.
+
+    Entries are dropped when the container is (re)started, as signalled by
+    its pebble-ready event, since directories outside of mounted storage do
+    not survive a container restart.
+    """
+
+    def __init__(
+        self, storage: ops.framework.BoundStoredState, container_name: str
+    ):
+        """Setup provisioned directory storage for container_name."""
+        self.storage = storage
+        self.container_name = container_name
+        try:
+            self.storage.provisioned_dirs
+        except AttributeError:
+            self.storage.provisioned_dirs = {}
+
+    @staticmethod
+    def _key(d: ContainerDir) -> str:
+        return json.dumps(list(d))
+
+    def __contains__(self, d: ContainerDir) -> bool:
+        """Check if the directory has been created with these attributes."""
+        provisioned = self.storage.provisioned_dirs.get(self.container_name)
+        return provisioned is not None and self._key(d) in provisioned
+
+    def add(self, dirs: typing.Sequence[ContainerDir]) -> None:
+        """Record directories as created."""
+        if self.container_name not in self.storage.provisioned_dirs:
+            self.storage.provisioned_dirs[self.container_name] = {}
+        provisioned = self.storage.provisioned_dirs[self.container_name]
+        for d in dirs:
+            provisioned[self._key(d)] = True
+
+    def reset(self) -> None:
+        """Forget all directories created in the container."""
+        self.storage.provisioned_dirs.pop(self.container_name, None)
+
+
+@sunbeam_tracing.trace_type
+class ServiceTemplateConfigContext(sunbeam_config_contexts.ConfigContext):
+    """Handler-specific render context."""
+
+    def __init__(
+        self,
+        charm: "OSBaseOperatorCharm",
+        heartbeat_in_pthread: bool,
+    ) -> None:
+        """Run constructor."""
+        self._heartbeat_in_pthread = heartbeat_in_pthread
+        super().__init__(charm, "service_template")
+
+    def context(self) -> sunbeam_core.ContextMapping:
+        """Context used when rendering templates."""
+        return {
+            "heartbeat_in_pthread": self._heartbeat_in_pthread,
+        }
+
+
+@sunbeam_tracing.trace_type
+class ContainerHealth:
+    """Point in time view of the services and checks of a container."""
+
+    def __init__(
+        self,
+        can_connect: bool,
+        services: typing.Mapping[str, ops.pebble.ServiceInfo] | None = None,
+        checks: typing.Mapping[str, ops.pebble.CheckInfo] | None = None,
+    ) -> None:
+        """Run constructor."""
+        self.can_connect = can_connect
+        self.services = services or {}
+        self.checks = checks or {}
+
+    @property
+    def services_running(self) -> bool:
+        """Whether all services in the container are running."""
+        return self.can_connect and all(
+            s.is_running() for s in self.services.values()
+        )
+
+    def checks_at(
+        self, level: ops.pebble.CheckLevel
+    ) -> dict[str, ops.pebble.CheckInfo]:
+        """Checks defined at the given level."""
+        return {
+            name: check
+            for name, check in self.checks.items()
+            if check.level == level
+        }
+
+    def failed_checks(self) -> list[str]:
+        """Names of failing checks.
+
+        Ready checks are used, falling back to alive checks if the
+        container does not define any ready checks.
+        """
+        checks = self.checks_at(ops.pebble.CheckLevel.READY)
+        if not checks:
+            checks = self.checks_at(ops.pebble.CheckLevel.ALIVE)
+        return [
+            name
+            for name, check in checks.items()
+            if check.status != ops.pebble.CheckStatus.UP
+        ]
+
+
+@sunbeam_tracing.trace_type
+class ContainerHealthSampler:
+    """Sample container health once per hook.
+
+    The sample is shared between all the pebble handlers managing the same
+    container. Fetching services and checks of all levels costs two Pebble
+    API calls per container, whatever the number of handlers.
+    """
+
+    def __init__(self, charm: "OSBaseOperatorCharm") -> None:
+        """Run constructor."""
+        self.charm = charm
+        self._samples: dict[str, ContainerHealth] = {}
+
+    def sample(self, container_name: str) -> ContainerHealth:
+        """Return the health of the container, sampling it if needed."""
+        if container_name not in self._samples:
+            self._samples[container_name] = self._take_sample(container_name)
+        return self._samples[container_name]
+
+    def invalidate(self, container_name: str) -> None:
+        """Drop the sample of the container."""
+        self._samples.pop(container_name, None)
+
+    def _take_sample(self, container_name: str) -> ContainerHealth:
+        """Query services and checks of the container."""
+        container = self.charm.unit.get_container(container_name)
+        try:
+            services = container.get_services()
+            checks = container.get_checks()
+        except (
+            ops.pebble.ConnectionError,
+            ops.pebble.APIError,
+            FileNotFoundError,
+        ):
+            logger.debug(f"Cannot sample health of {container_name}")
+            return ContainerHealth(False)
+        return ContainerHealth(True, services, checks)
+
+
+@sunbeam_tracing.trace_type
+class PebbleHandler(ops.framework.Object, metaclass=sunbeam_core.PostInitMeta):
+    """Base handler for Pebble based containers."""
+
+    def __init__(
+        self,
+        charm: "OSBaseOperatorCharmK8S",
+        container_name: str,
+        service_name: str,
+        container_configs: list[sunbeam_core.ContainerConfigFile],
+        template_dir: str,
+        callback_f: Callable,
+    ) -> None:
+        """Run constructor."""
+        super().__init__(charm, None)
+        self.charm = charm
+        self.container_name = container_name
+        self.service_name = service_name
+        self.container_configs = container_configs
+        self.container_configs.extend(self.default_container_configs())
+        self.template_dir = template_dir
+        self.callback_f = callback_f
+
+        self.status = compound_status.Status("container:" + container_name)
+        self.charm.status_pool.add(self.status)
+
+        self.framework.observe(
+            self.charm.on.update_status, self._on_update_status
+        )
+        self._files_changed: list[str] = []
+
+    def __post_init__(self) -> None:
+        """Post init."""
+        self.setup_pebble_handler()
+
+    def setup_pebble_handler(self) -> None:
+        """Configure handler for pebble ready event."""
+        prefix = self.container_name.replace("-", "_")
+        pebble_ready_event = getattr(self.charm.on, f"{prefix}_pebble_ready")
+        pebble_check_failed = getattr(
+            self.charm.on, f"{prefix}_pebble_check_failed"
+        )
+        pebble_check_recovered = getattr(
+            self.charm.on, f"{prefix}_pebble_check_recovered"
+        )
+        self.framework.observe(
+            pebble_ready_event, self._on_service_pebble_ready
+        )
+        self.framework.observe(
+            pebble_check_failed, self._on_pebble_check_failed
+        )
+        self.framework.observe(
+            pebble_check_recovered, self._on_pebble_check_recovered
+        )
+
+    def _on_service_pebble_ready(
+        self, event: ops.charm.PebbleReadyEvent
+    ) -> None:
+        """Handle pebble ready event."""
+        container = event.workload
+        # The container may have been recreated, so previously rendered
+        # files cannot be assumed to be present.
+        self.rendered_files.reset()
+        self.provisioned_dirs.reset()
+        container.add_layer(self.service_name, self.get_layer(), combine=True)
+        self.charm.configure_charm(event)
+
+    def _on_pebble_check_failed(
+        self, event: ops.charm.PebbleCheckFailedEvent
+    ) -> None:
+        """Handle pebble check failed event."""
+        self._on_update_status(event)
+
+    def _on_pebble_check_recovered(
+        self, event: ops.charm.PebbleCheckRecoveredEvent
+    ) -> None:
+        """Handle pebble check recovered event."""
+        self._on_update_status(event)
+
+    @property
+    def enable_rabbit_heartbeat_in_pthread(self) -> bool:
+        """Whether rabbit heartbeat should be handled in a pthread."""
+        return False
+
+    def service_template_context(self) -> ServiceTemplateConfigContext:
+        """Handler-specific template context."""
+        return ServiceTemplateConfigContext(
+            self.charm,
+            heartbeat_in_pthread=self.enable_rabbit_heartbeat_in_pthread,
+        )
+
+    def render_context(
+        self, context: sunbeam_core.OPSCharmContexts
+    ) -> sunbeam_core.OPSCharmContexts:
+        """Context used when rendering templates."""
+        if "service_template" not in context.namespaces:
+            context.add_config_context(
+                self.service_template_context(), "service_template"
+            )
+        else:
+            setattr(
+                context, "service_template", self.service_template_context()
+            )
+        return context
+
+    @property
+    def rendered_files(self) -> sunbeam_templating.RenderedFileStorage:
+        """Digests of the files last rendered into the container."""
+        return sunbeam_templating.RenderedFileStorage(
+            self.charm._state, self.container_name
+        )
+
+    def write_config(
+        self, context: sunbeam_core.OPSCharmContexts
+    ) -> list[str]:
+        """Write configuration files into the container.
+
+        Write self.container_configs into container if there contents
+        have changed. Rendering is skipped for files whose template and
+        referenced context namespaces are unchanged since the last
+        successful render.
+
+        :return: List of files that were updated
+        :rtype: List
+        """
+        files_updated = []
+        container = self.charm.unit.get_container(self.container_name)
+        render_context = self.render_context(context)
+        rendered_files = self.rendered_files
+        if container:
+            for config in self.container_configs:
+                digest = sunbeam_templating.render_digest(
+                    self.template_dir, config, render_context
+                )
+                if rendered_files.get(config.path) == digest:
+                    logger.debug(
+                        f"Inputs of {config.path} unchanged, skipping render"
+                    )
+                    continue
+                changed = sunbeam_templating.sidecar_config_render(
+                    container,
+                    config,
+                    self.template_dir,
+                    render_context,
+                )
+                rendered_files.set(config.path, digest)
+                if changed:
+                    files_updated.append(config.path)
+                    logger.debug(f"Changes detected in {files_updated}")
+                else:
+                    logger.debug("No file changes detected")
+        else:
+            logger.debug("Container not ready")
+        if files_updated:
+            logger.debug(f"Changes detected in {files_updated}")
+        else:
+            logger.debug("No file changes detected")
+        return files_updated
+
+    def get_layer(self) -> ops.pebble.LayerDict:
+        """Pebble configuration layer for the container."""
+        return {}
+
+    def get_healthcheck_layer(self) -> ops.pebble.LayerDict:
+        """Pebble configuration for health check layer for the container."""
+        return {}
+
+    @property
+    def directories(self) -> list[ContainerDir]:
+        """List of directories to create in container."""
+        return []
+
+    @property
+    def provisioned_dirs(self) -> ProvisionedDirStorage:
+        """Directories already created in the container."""
+        return ProvisionedDirStorage(self.charm._state, self.container_name)
+
+    def setup_dirs(self) -> None:
+        """Create directories in container.
+
+        Directories already created with the same attributes since the
+        container last started are skipped.
+        """
+        if not self.directories:
+            return
+        provisioned = self.provisioned_dirs
+        pending = [d for d in self.directories if d not in provisioned]
+        if not pending:
+            logger.debug("All directories already provisioned")
+            return
+        for d in pending:
+            logger.debug(f"Creating {d.path}")
+        container = self.charm.unit.get_container(self.container_name)
+        make_dirs(container, pending)
+        provisioned.add(pending)
+
+    def _reset_files_changed(self) -> None:
+        """Reset list of files changed."""
+        self._files_changed = []
+
+    def configure_container(
+        self, context: sunbeam_core.OPSCharmContexts
+    ) -> None:
+        """Write configuration files to the container."""
+        self.setup_dirs()
+        self._files_changed.extend(self.write_config(context))
+        self.files_changed(self._files_changed)
+
+    def init_service(self, context: sunbeam_core.OPSCharmContexts) -> None:
+        """Initialise service ready for use.
+
+        Record that service is ready for us.
+        """
+        self.configure_container(context)
+        self.status.set(ActiveStatus(""))
+
+    def default_container_configs(
+        self,
+    ) -> list[sunbeam_core.ContainerConfigFile]:
+        """Generate default container configurations.
+
+        These should be used by all inheriting classes and are
+        automatically added to the list or container configurations
+        provided during object instantiation.
+        """
+        return []
+
+    @property
+    def pebble_ready(self) -> bool:
+        """Determine if pebble is running and ready for use."""
+        return self.charm.unit.get_container(self.container_name).can_connect()
+
+    @property
+    def service_ready(self) -> bool:
+        """Determine whether the service the container provides is running."""
+        if not self.pebble_ready:
+            return False
+        container = self.charm.unit.get_container(self.container_name)
+        services = container.get_services()
+        return all(s.is_running() for s in services.values())
+
+    def execute(
+        self,
+        cmd: list[str],
+        exception_on_error: bool = False,
+        timeout: float | None = None,
+        tail_lines: int | None = None,
+        **kwargs,
+    ) -> str:
+        """Execute given command in container managed by this handler.
+
+        Output is logged line by line as it arrives. Only the last
+        EXEC_ERROR_TAIL_LINES lines of stderr are kept to report failures.
+
+        :param cmd: command to execute, specified as a list of strings
+        :param exception_on_error: determines whether or not to raise
+            an exception if the command fails. By default, this method
+            will not raise an exception if the command fails. If it is
+            raised, this will rase an ops.pebble.ExecError.
+        :param timeout: seconds after which the command is terminated.
+            A timed out command raises an ops.pebble.ChangeError.
+        :param tail_lines: if set, only keep and return the last
+            tail_lines lines of stdout. Use it for long running commands
+            whose output is not consumed.
+        :param kwargs: arguments to pass into the ops.model.Container's
+            execute command.
+        """
+        container = self.charm.unit.get_container(self.container_name)
+        stdout_writer = _LogWriter(logger.debug, max_lines=tail_lines)
+        stderr_writer = _LogWriter(
+            logger.debug, max_lines=EXEC_ERROR_TAIL_LINES
+        )
+        process = container.exec(
+            cmd,
+            stdout=typing.cast(typing.TextIO, stdout_writer),
+            stderr=typing.cast(typing.TextIO, stderr_writer),
+            timeout=timeout,
+            **kwargs,
+        )
+        try:
+            process.wait()
+        except ops.pebble.ExecError as e:
+            stderr_writer.flush()
+            logger.error("Exited with code %d. Stderr:", e.exit_code)
+            stderr_writer.log_tail(logger.error)
+            if exception_on_error:
+                raise
+            return ""
+        except ops.pebble.ChangeError:
+            stderr_writer.flush()
+            logger.error("Command %s did not complete. Stderr:", cmd[0])
+            stderr_writer.log_tail(logger.error)
+            raise
+        finally:
+            stdout_writer.flush()
+            stderr_writer.flush()
+        logger.debug("Command complete")
+        return stdout_writer.getvalue()
+
+    def add_healthchecks(self) -> None:
+        """Add healthcheck layer to the plan."""
+        healthcheck_layer = self.get_healthcheck_layer()
+        if not healthcheck_layer:
+            logger.debug("Healthcheck layer not defined in pebble handler")
+            return
+
+        container = self.charm.unit.get_container(self.container_name)
+        try:
+            plan = container.get_plan()
+            if not plan.checks:
+                logger.debug("Adding healthcheck layer to the plan")
+                container.add_layer(
+                    "healthchecks", healthcheck_layer, combine=True
+                )
+        except ops.pebble.ConnectionError as connect_error:
+            logger.error("Not able to add Healthcheck layer")
+            logger.exception(connect_error)
+
+    def _on_update_status(self, event: ops.framework.EventBase) -> None:
+        """Assess and set status.
+
+        Also takes into account healthchecks.
+        """
+        health = self.charm.health_sampler.sample(self.container_name)
+        if not health.can_connect:
+            self.status.set(WaitingStatus("pebble not ready"))
+            return
+
+        if not health.services_running:
+            self.status.set(WaitingStatus("service not ready"))
+            return
+
+        failed = health.failed_checks()
+        if failed:
+            self.status.set(
+                BlockedStatus(
+                    "healthcheck{} failed: {}".format(
+                        "s" if len(failed) > 1 else "", ", ".join(failed)
+                    )
+                )
+            )
+            return
+
+        self.status.set(ActiveStatus(""))
+
+    @staticmethod
+    def _restart_service(container: ops.Container, service_name: str) -> None:
+        """Restart service in container.
+
+        :param container: Container to restart service in.
+        :param service_name: Service to restart.
+        """
+        container.restart(service_name)
+
+    @property
+    def _restart_methods(
+        self,
+    ) -> typing.Mapping[str, Callable[[ops.Container, str], None]]:
+        """Mapping of service names to restart methods."""
+        return {}
+
+    def start_all(
+        self,
+        restart: bool = True,
+    ) -> None:
+        """Start services in container.
+
+        :param restart: Whether to stop services before starting them.
+        """
+        container = self.charm.unit.get_container(self.container_name)
+        if not container.can_connect():
+            logger.debug(
+                f"Container {self.container_name} not ready, deferring restart"
+            )
+            return
+        services = container.get_services()
+        for service_name, service in services.items():
+            if not service.is_running():
+                logger.debug(
+                    f"Starting {service_name} in {self.container_name}"
+                )
+                container.start(service_name)
+                self._reset_files_changed()
+                continue
+
+            if restart:
+                logger.debug(
+                    f"Restarting {service_name} in {self.container_name}"
+                )
+                self._restart_methods.get(service_name, self._restart_service)(
+                    container, service_name
+                )
+                self._reset_files_changed()
+        self.charm.health_sampler.invalidate(self.container_name)
+
+    def stop_all(self) -> None:
+        """Stop services in container."""
+        container = self.charm.unit.get_container(self.container_name)
+        if not container.can_connect():
+            logger.debug(
+                f"Container {self.container_name} not ready, no need to stop"
+            )
+            return
+
+        services = container.get_services()
+        if services:
+            logger.debug("Stopping all services")
+            container.stop(*services.keys())
+            self.charm.health_sampler.invalidate(self.container_name)
+
+    def files_changed(self, files: list[str]):
+        """Called when files have changed before restarting services."""
+
+
+@sunbeam_tracing.trace_type
+class ServicePebbleHandler(PebbleHandler):
+    """Container handler for containers which manage a service."""
+
+    def init_service(self, context: sunbeam_core.OPSCharmContexts) -> None:
+        """Initialise service ready for use.
+
+        Write configuration files to the container and record
+        that service is ready for us.
+        """
+        self.configure_container(context)
+        if self._files_changed:
+            self.start_service(restart=True)
+        else:
+            self.start_service(restart=False)
+        self.status.set(ActiveStatus(""))
+
+    def start_service(self, restart: bool = True) -> None:
+        """Check and start services in container.
+
+        :param restart: Whether to stop services before starting them.
+        """
+        container = self.charm.unit.get_container(self.container_name)
+        if not container:
+            logger.debug(
+                f"{self.container_name} container is not ready. "
+                "Cannot start service."
+            )
+            return
+        if self.service_name not in container.get_services().keys():
+            container.add_layer(
+                self.service_name, self.get_layer(), combine=True
+            )
+        self.start_all(restart=restart)
+
+
+@sunbeam_tracing.trace_type
+class WSGIPebbleHandler(PebbleHandler):
+    """WSGI oriented handler for a Pebble managed container."""
+
+    charm: "OSBaseOperatorAPICharm"
+
+    def __init__(
+        self,
+        charm: "OSBaseOperatorAPICharm",
+        container_name: str,
+        service_name: str,
+        container_configs: list[sunbeam_core.ContainerConfigFile],
+        template_dir: str,
+        callback_f: Callable,
+        wsgi_service_name: str,
+    ) -> None:
+        """Run constructor."""
+        super().__init__(
+            charm,
+            container_name,
+            service_name,
+            container_configs,
+            template_dir,
+            callback_f,
+        )
+        self.wsgi_service_name = wsgi_service_name
+
+    @property
+    def enable_rabbit_heartbeat_in_pthread(self) -> bool:
+        """Whether rabbit heartbeat should be handled in a pthread."""
+        return True
+
+    def start_wsgi(self, restart: bool = True) -> None:
+        """Check and start services in container.
+
+        :param restart: Whether to stop services before starting them.
+        """
+        container = self.charm.unit.get_container(self.container_name)
+        if not container:
+            logger.debug(
+                f"{self.container_name} container is not ready. "
+                "Cannot start wgi service."
+            )
+            return
+        if self.wsgi_service_name not in container.get_services().keys():
+            container.add_layer(
+                self.service_name, self.get_layer(), combine=True
+            )
+        self.start_all(restart=restart)
+
+    def start_service(self) -> None:
+        """Start the service."""
+        self.start_wsgi()
+
+    def get_layer(self) -> ops.pebble.LayerDict:
+        """Apache WSGI service pebble layer.
+
+        :returns: pebble layer configuration for wsgi service
+        """
+        return {
+            "summary": f"{self.service_name} layer",
+            "description": "pebble config layer for apache wsgi",
+            "services": {
+                f"{self.wsgi_service_name}": {
+                    "override": "replace",
+                    "summary": f"{self.service_name} wsgi",
+                    "command": "/usr/sbin/apache2 -DFOREGROUND -DNO_DETACH",
+                    "startup": "disabled",
+                    "environment": {
+                        "APACHE_RUN_DIR": "/var/run/apache2",
+                        "APACHE_PID_FILE": "/var/run/apache2/apache2.pid",
+                        "APACHE_LOCK_DIR": "/var/lock/apache2",
+                        "APACHE_RUN_USER": "www-data",
+                        "APACHE_RUN_GROUP": "www-data",
+                        "APACHE_LOG_DIR": "/var/log/apache2",
+                    },
+                },
+            },
+        }
+
+    def get_healthcheck_layer(self) -> ops.pebble.LayerDict:
+        """Apache WSGI health check pebble layer.
+
+        :returns: pebble health check layer configuration for wsgi service
+        """
+        return {
+            "checks": {
+                "up": {
+                    "override": "replace",
+                    "level": "alive",
+                    "period": "10s",
+                    "timeout": "3s",
+                    "threshold": 3,
+                    "exec": {"command": "service apache2 status"},
+                },
+                "online": {
+                    "override": "replace",
+                    "level": "ready",
+                    "period": self.charm.healthcheck_period,
+                    "timeout": self.charm.healthcheck_http_timeout,
+                    "http": {"url": self.charm.healthcheck_http_url},
+                },
+            }
+        }
+
+    def init_service(self, context: sunbeam_core.OPSCharmContexts) -> None:
+        """Enable and start WSGI service."""
+        container = self.charm.unit.get_container(self.container_name)
+        self.configure_container(context)
+        try:
+            process = container.exec(
+                ["a2ensite", self.wsgi_service_name], timeout=5 * 60
+            )
+            out, warnings = process.wait_output()
+            if warnings:
+                for line in warnings.splitlines():
+                    logger.warning("a2ensite warn: %s", line.strip())
+            logging.debug(f"Output from a2ensite: \n{out}")
+        except ops.pebble.ExecError:
+            logger.exception(
+                f"Failed to enable {self.wsgi_service_name} site in apache"
+            )
+            # ignore for now - pebble is raising an exited too quickly, but it
+            # appears to work properly.
+        self._files_changed.extend(self.write_config(context))
+        self.files_changed(self._files_changed)
+        if self._files_changed:
+            self.start_wsgi(restart=True)
+        else:
+            self.start_wsgi(restart=False)
+        self.status.set(ActiveStatus(""))
+
+    @property
+    def wsgi_conf(self) -> str:
+        """Location of WSGI config file."""
+        return f"/etc/apache2/sites-available/wsgi-{self.service_name}.conf"
+
+    def default_container_configs(
+        self,
+    ) -> list[sunbeam_core.ContainerConfigFile]:
+        """Container configs for WSGI service."""
+        return [
+            sunbeam_core.ContainerConfigFile(self.wsgi_conf, "root", "root")
+        ]